@@ -1,10 +1,6 @@
-def exchange(s): 
-    dic = {'u': 'd', 'd': 'u', 'l': 'r', 'r': 'l'} 
-    seq = list(s) 
-    seq = [dic[move] for move in seq] 
-    return ''.join(seq)
+import poc_fifteen_moves
 
 def reverse(s):
-    return exchange(s[::-1])
+    return poc_fifteen_moves.reverse_moves(s)
 
 print reverse("rdldurldurdluurddluurddluurdlrldrulurdld")
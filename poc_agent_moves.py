@@ -0,0 +1,56 @@
+"""
+Batch agent movement
+Moves every agent of a simulation one step on a distance field in a
+single pass over flat cell indices
+"""
+
+EMPTY = 0
+
+
+def move_agents(grid, distance, agents, eight_way, flee, rng):
+    """
+    Move every agent in agents (flat indices into the FlatGrid grid)
+    one step on the flat distance field: away from its sources when
+    flee is True, towards them otherwise
+    Candidates are the empty neighbors (eight-way or four-way) plus the
+    current cell; ties are broken with rng, a random.Random instance, so
+    runs are reproducible for a given seed
+    Agents with no empty candidate stay put
+    Returns a list of new flat indices, in the order of agents
+    """
+    cells = grid.get_cells()
+    mask = grid.get_neighbor_mask()
+    table = grid.neighbor_offsets(eight_way)
+    rand = rng.random
+
+    # candidate scoring depends only on the cell, so agents that share a
+    # cell share the work
+    choices = {}
+    moved = []
+    append = moved.append
+    for cell in agents:
+        ties = choices.get(cell)
+        if ties is None:
+            best = None
+            ties = []
+            if cells[cell] == EMPTY:
+                best = distance[cell]
+                ties = [cell]
+            for delta in table[mask[cell]]:
+                candidate = cell + delta
+                if cells[candidate] != EMPTY:
+                    continue
+                score = distance[candidate]
+                if best is None or (score > best if flee else score < best):
+                    best = score
+                    ties = [candidate]
+                elif score == best:
+                    ties.append(candidate)
+            if not ties:
+                ties = [cell]
+            choices[cell] = ties
+        if len(ties) == 1:
+            append(ties[0])
+        else:
+            append(ties[int(rand() * len(ties))])
+    return moved
@@ -0,0 +1,264 @@
+"""
+Micro-benchmarks for the poc_* support classes
+Run this file directly to print a throughput table for each benchmark
+"""
+
+import random
+import timeit
+
+import poc_agent_moves
+import poc_distance_field
+import poc_grid
+import poc_queue
+import poc_sorted_lists
+
+# sizes used by the frontier benchmarks
+FRONTIER_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+
+def best_time(func, repeat = 3):
+    """
+    Call func repeat times and return the fastest wall-clock time
+    in seconds
+    """
+    timer = timeit.default_timer
+    best = None
+    for dummy_idx in range(repeat):
+        start = timer()
+        func()
+        elapsed = timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(name, size, seconds):
+    """
+    Print one line of a benchmark table
+    """
+    rate = size / seconds if seconds > 0 else float("inf")
+    print("%-28s %10d items %10.4f s %14.0f items/s" % (name, size, seconds, rate))
+
+
+def bench_queue(sizes = FRONTIER_SIZES):
+    """
+    Frontier throughput of poc_queue.Queue: push every item through
+    the queue one at a time and in bulk, as a BFS frontier would
+    """
+    for size in sizes:
+        items = range(size)
+
+        def one_at_a_time():
+            """
+            Enqueue and dequeue each item individually
+            """
+            queue = poc_queue.Queue()
+            for item in items:
+                queue.enqueue(item)
+            while len(queue):
+                queue.dequeue()
+
+        def bulk():
+            """
+            Enqueue and dequeue the whole frontier in one call each
+            """
+            queue = poc_queue.Queue()
+            queue.enqueue_many(items)
+            queue.dequeue_many()
+
+        report("queue enqueue/dequeue", size, best_time(one_at_a_time))
+        report("queue enqueue/dequeue_many", size, best_time(bulk))
+
+
+def bench_grid(sizes = (100, 1000, 2000)):
+    """
+    Neighbor query throughput of poc_grid.Grid (per cell, tuples) against
+    poc_grid.FlatGrid walked with its mask and offset tables, the way the
+    distance field engines use it, on square grids
+    """
+    for side in sizes:
+        cells = side * side
+        flat = poc_grid.FlatGrid(side, side)
+
+        def flat_offsets():
+            """
+            Four-neighbors of every cell from the mask and offset tables
+            """
+            mask = flat.get_neighbor_mask()
+            table = flat.neighbor_offsets()
+            return [idx + delta for idx in range(cells) for delta in table[mask[idx]]]
+
+        if side <= 1000:
+            grid = poc_grid.Grid(side, side)
+
+            def per_cell():
+                """
+                Four-neighbors of every cell, one call per cell
+                """
+                for row in range(side):
+                    for col in range(side):
+                        grid.four_neighbors(row, col)
+
+            report("Grid.four_neighbors", cells, best_time(per_cell, 1))
+        report("FlatGrid offset tables", cells, best_time(flat_offsets, 1))
+
+
+def bench_distance_field(side = 1000, source_counts = (1, 1000, 5000),
+                         obstacle_ratio = 0.2, seed = 0):
+    """
+    Multi-source BFS distance field on a side x side map with random
+    obstacles, for a few source counts
+    """
+    rng = random.Random(seed)
+    for num_sources in source_counts:
+        grid, sources = poc_distance_field.random_scenario(
+            side, side, num_sources, obstacle_ratio, rng)
+        engine = poc_distance_field.DistanceField(grid)
+        name = "distance field %d sources" % num_sources
+        report(name, side * side, best_time(lambda: engine.compute(sources)))
+
+
+def bench_incremental_distance_field(side = 1000, num_sources = 2000, movers = 10,
+                                     ticks = 10, obstacle_ratio = 0.2, seed = 0):
+    """
+    Per-tick cost of a full distance field against an incremental repair
+    when a few of the sources step to a neighboring cell each tick,
+    checking the repaired field against a full recomputation at the end
+    """
+    rng = random.Random(seed)
+    grid, sources = poc_distance_field.random_scenario(
+        side, side, num_sources, obstacle_ratio, rng)
+    cells = grid.get_cells()
+    table = grid.neighbor_offsets()
+    mask = grid.get_neighbor_mask()
+    history = [list(sources)]
+    for dummy_tick in range(ticks):
+        sources = list(sources)
+        for pos in rng.sample(range(len(sources)), min(movers, len(sources))):
+            idx = sources[pos]
+            sources[pos] = rng.choice([idx] + [idx + delta for delta in table[mask[idx]]
+                                               if cells[idx + delta] == poc_distance_field.EMPTY])
+        history.append(sources)
+
+    full = poc_distance_field.DistanceField(grid)
+    incremental = poc_distance_field.IncrementalDistanceField(grid)
+    incremental.compute(history[0])
+
+    def run_full():
+        """
+        Recompute the field from scratch every tick
+        """
+        for tick_sources in history[1:]:
+            full.compute(tick_sources)
+
+    def run_incremental():
+        """
+        Repair the field every tick
+        """
+        for tick_sources in history[1:]:
+            incremental.update(tick_sources)
+
+    report("full field per tick", ticks, best_time(run_full, 1))
+    report("incremental field per tick", ticks, best_time(run_incremental, 1))
+    print("incremental matches full: %s" % incremental.matches_full())
+
+
+def bench_agent_moves(side = 1000, agent_counts = (10 ** 5, 10 ** 6),
+                      obstacle_ratio = 0.2, seed = 0):
+    """
+    One batched flee step (eight-way) and one stalk step (four-way) for
+    every agent on a side x side map with random obstacles
+    """
+    rng = random.Random(seed)
+    for num_agents in agent_counts:
+        grid, sources = poc_distance_field.random_scenario(
+            side, side, 100, obstacle_ratio, rng)
+        cells = grid.get_cells()
+        empty = [idx for idx in range(side * side)
+                 if cells[idx] == poc_distance_field.EMPTY]
+        agents = [rng.choice(empty) for dummy_idx in range(num_agents)]
+        distance = poc_distance_field.DistanceField(grid).compute(sources)
+
+        def flee():
+            """
+            Move every agent away from the sources
+            """
+            poc_agent_moves.move_agents(grid, distance, agents, True, True, rng)
+
+        def stalk():
+            """
+            Move every agent towards the sources
+            """
+            poc_agent_moves.move_agents(grid, distance, agents, False, False, rng)
+
+        report("agents flee", num_agents, best_time(flee, 1))
+        report("agents stalk", num_agents, best_time(stalk, 1))
+
+
+def random_words(count, rng, min_length = 3, max_length = 10):
+    """
+    Return count random lowercase words
+    """
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters)
+                    for dummy_idx in range(rng.randint(min_length, max_length)))
+            for dummy_word in range(count)]
+
+
+def bench_sorted_lists(size = 200000, seed = 0):
+    """
+    Two-pointer operations and merge sort of poc_sorted_lists on
+    dictionaries of size synthetic words; short words make duplicates
+    and overlap common
+    """
+    rng = random.Random(seed)
+    unsorted = random_words(size, rng, 2, 6)
+    words1 = sorted(unsorted)
+    words2 = sorted(random_words(size, rng, 2, 6))
+
+    def merge_sort():
+        """
+        Sort the unsorted word list
+        """
+        poc_sorted_lists.merge_sort(unsorted)
+
+    def remove_duplicates():
+        """
+        Deduplicate one word list
+        """
+        list(poc_sorted_lists.remove_duplicates(words1))
+
+    def intersect():
+        """
+        Intersect the two word lists
+        """
+        list(poc_sorted_lists.intersect(words1, words2))
+
+    def merge():
+        """
+        Merge the two word lists
+        """
+        list(poc_sorted_lists.merge(words1, words2))
+
+    report("remove_duplicates", size, best_time(remove_duplicates))
+    report("intersect", 2 * size, best_time(intersect))
+    report("merge", 2 * size, best_time(merge))
+    report("merge_sort", size, best_time(merge_sort))
+    report("merge_sort (sorted input)", size,
+           best_time(lambda: poc_sorted_lists.merge_sort(words1)))
+
+
+def run_all():
+    """
+    Run every benchmark in this module
+    """
+    bench_queue()
+    bench_grid()
+    bench_distance_field()
+    bench_incremental_distance_field()
+    bench_agent_moves()
+    bench_sorted_lists()
+
+
+if __name__ == "__main__":
+    run_all()
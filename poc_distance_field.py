@@ -0,0 +1,293 @@
+"""
+Distance field engine
+Multi-source breadth first search over a poc_grid.FlatGrid using flat
+cell indices and buffers that are allocated once and reused
+"""
+
+import heapq
+from array import array
+
+import poc_grid
+
+EMPTY = 0
+FULL = 1
+
+
+class DistanceField:
+    """
+    Four-way BFS distance field over the cells of a FlatGrid
+    Distance at a source is zero, obstacles are never entered and
+    unreachable cells hold grid_height * grid_width
+    """
+
+    def __init__(self, grid):
+        """
+        Bind the engine to a FlatGrid and allocate its buffers
+        """
+        self._grid = grid
+        self._grid_height = grid.get_grid_height()
+        self._grid_width = grid.get_grid_width()
+        self._unreachable = self._grid_height * self._grid_width
+        self._blank = array("l", [self._unreachable]) * self._unreachable
+        self._distance = array("l", self._blank)
+
+    def get_unreachable(self):
+        """
+        Return the distance stored in cells no source can reach
+        """
+        return self._unreachable
+
+    def get_distance(self):
+        """
+        Return the flat distance buffer
+        The buffer is reused, so its contents change on the next compute
+        """
+        return self._distance
+
+    def compute(self, sources):
+        """
+        Compute the distance field from an iterable of flat source indices
+        Returns the flat distance buffer
+        """
+        distance = self._distance
+        distance[:] = self._blank
+        cells = self._grid.get_cells()
+        mask = self._grid.get_neighbor_mask()
+        table = self._grid.neighbor_offsets()
+        unreachable = self._unreachable
+
+        frontier = []
+        for idx in sources:
+            if distance[idx] != 0:
+                distance[idx] = 0
+                frontier.append(idx)
+
+        score = 0
+        while frontier:
+            score += 1
+            next_frontier = []
+            append = next_frontier.append
+            for idx in frontier:
+                for delta in table[mask[idx]]:
+                    neighbor = idx + delta
+                    if distance[neighbor] == unreachable and cells[neighbor] == EMPTY:
+                        distance[neighbor] = score
+                        append(neighbor)
+            frontier = next_frontier
+        return distance
+
+    def as_rows(self):
+        """
+        Return the current distance field as a list of row lists
+        """
+        width = self._grid_width
+        distance = self._distance
+        return [distance[row * width:(row + 1) * width].tolist()
+                for row in range(self._grid_height)]
+
+
+class IncrementalDistanceField(DistanceField):
+    """
+    Distance field that keeps its previous result and repairs only the
+    region affected when sources move or obstacles change
+
+    A repair runs in two passes, in the style of dynamic BFS / D* Lite:
+    cells that lost every neighbor one step closer to a source are
+    invalidated in order of increasing old distance, then distances are
+    relaxed outwards from new sources, reopened cells and the valid
+    border of the invalidated region
+    """
+
+    def __init__(self, grid, max_change_ratio = 0.05):
+        """
+        Bind the engine to a FlatGrid; updates touching more than
+        max_change_ratio of the cells fall back to a full computation
+        """
+        DistanceField.__init__(self, grid)
+        self._max_changes = max(1, int(max_change_ratio * self._unreachable))
+        self._sources = None
+        self._blocked = None
+
+    def reset(self):
+        """
+        Forget the previous field so that the next update is a full computation
+        """
+        self._sources = None
+        self._blocked = None
+
+    def compute(self, sources):
+        """
+        Compute the distance field from scratch and remember its sources
+        Returns the flat distance buffer
+        """
+        self._sources = set(sources)
+        self._blocked = bytearray(self._grid.get_cells())
+        return DistanceField.compute(self, self._sources)
+
+    def update(self, sources, changed_cells = ()):
+        """
+        Bring the distance field up to date with a new iterable of flat
+        source indices, given the flat indices of every cell whose
+        obstacle status may have changed since the last update
+        Returns the flat distance buffer
+        """
+        if self._sources is None:
+            return self.compute(sources)
+
+        sources = set(sources)
+        removed = list(self._sources - sources)
+        added = list(sources - self._sources)
+
+        cells = self._grid.get_cells()
+        blocked = self._blocked
+        filled = []
+        opened = []
+        for idx in set(changed_cells):
+            if cells[idx] != blocked[idx]:
+                blocked[idx] = cells[idx]
+                if cells[idx] == EMPTY:
+                    opened.append(idx)
+                else:
+                    filled.append(idx)
+
+        if len(removed) + len(added) + len(filled) + len(opened) > self._max_changes:
+            return self.compute(sources)
+        self._sources = sources
+
+        filled = [idx for idx in filled if idx not in sources]
+        invalid = self._invalidate(removed + filled, sources)
+        self._relax(added, invalid + opened, sources)
+        return self._distance
+
+    def _invalidate(self, seeds, sources):
+        """
+        Reset to unreachable every cell whose distance depended on the
+        seed cells (removed sources and new obstacles)
+        Returns the list of invalidated cells, seeds included
+        """
+        distance = self._distance
+        mask = self._grid.get_neighbor_mask()
+        table = self._grid.neighbor_offsets()
+        unreachable = self._unreachable
+
+        invalid = []
+        buckets = {}
+        heap = []
+        for idx in seeds:
+            old = distance[idx]
+            if old == unreachable:
+                continue
+            distance[idx] = unreachable
+            invalid.append(idx)
+            for delta in table[mask[idx]]:
+                neighbor = idx + delta
+                if distance[neighbor] == old + 1:
+                    if old + 1 not in buckets:
+                        buckets[old + 1] = []
+                        heapq.heappush(heap, old + 1)
+                    buckets[old + 1].append(neighbor)
+
+        while heap:
+            score = heapq.heappop(heap)
+            for idx in buckets.pop(score):
+                if distance[idx] != score or idx in sources:
+                    continue
+                supported = False
+                for delta in table[mask[idx]]:
+                    if distance[idx + delta] == score - 1:
+                        supported = True
+                        break
+                if supported:
+                    continue
+                distance[idx] = unreachable
+                invalid.append(idx)
+                for delta in table[mask[idx]]:
+                    neighbor = idx + delta
+                    if distance[neighbor] == score + 1:
+                        if score + 1 not in buckets:
+                            buckets[score + 1] = []
+                            heapq.heappush(heap, score + 1)
+                        buckets[score + 1].append(neighbor)
+        return invalid
+
+    def _relax(self, added, reopened, sources):
+        """
+        Propagate distance decreases from the new sources and from the
+        valid neighbors of every reopened (invalidated or cleared) cell
+        """
+        distance = self._distance
+        cells = self._grid.get_cells()
+        mask = self._grid.get_neighbor_mask()
+        table = self._grid.neighbor_offsets()
+        unreachable = self._unreachable
+
+        buckets = {}
+        for idx in added:
+            distance[idx] = 0
+            buckets.setdefault(0, []).append(idx)
+        for idx in reopened:
+            if idx in sources or cells[idx] != EMPTY:
+                continue
+            best = unreachable
+            for delta in table[mask[idx]]:
+                if distance[idx + delta] + 1 < best:
+                    best = distance[idx + delta] + 1
+            if best < distance[idx]:
+                distance[idx] = best
+                buckets.setdefault(best, []).append(idx)
+        heap = list(buckets)
+        heapq.heapify(heap)
+
+        while heap:
+            score = heapq.heappop(heap)
+            frontier = buckets.pop(score)
+            score += 1
+            next_frontier = []
+            append = next_frontier.append
+            for idx in frontier:
+                if distance[idx] != score - 1:
+                    continue
+                for delta in table[mask[idx]]:
+                    neighbor = idx + delta
+                    if distance[neighbor] > score and cells[neighbor] == EMPTY:
+                        distance[neighbor] = score
+                        append(neighbor)
+            if next_frontier:
+                if score in buckets:
+                    buckets[score].extend(next_frontier)
+                else:
+                    buckets[score] = next_frontier
+                    heapq.heappush(heap, score)
+
+    def matches_full(self):
+        """
+        Correctness check: recompute the field from scratch for the
+        current sources and compare it with the incrementally kept one
+        """
+        check = DistanceField(self._grid)
+        return check.compute(self._sources) == self._distance
+
+
+def compute_distance_field(grid, cells):
+    """
+    Convenience wrapper: distance field of a FlatGrid from an iterable
+    of (row, col) source cells, returned as a list of row lists
+    """
+    engine = DistanceField(grid)
+    engine.compute(grid.index(row, col) for row, col in cells)
+    return engine.as_rows()
+
+
+def random_scenario(grid_height, grid_width, num_sources, obstacle_ratio, rng):
+    """
+    Build a FlatGrid with randomly placed obstacles and return it with a
+    list of flat source indices on empty cells, for benchmarks and checks
+    """
+    grid = poc_grid.FlatGrid(grid_height, grid_width)
+    cells = grid.get_cells()
+    size = grid_height * grid_width
+    for idx in range(size):
+        if rng.random() < obstacle_ratio:
+            cells[idx] = FULL
+    empty = [idx for idx in range(size) if cells[idx] == EMPTY]
+    return grid, rng.sample(empty, min(num_sources, len(empty)))
@@ -0,0 +1,152 @@
+"""
+External merge sort for word files larger than memory
+Reads words (one per line) in runs of a bounded size, sorts each run in
+memory and spills it to a temporary file, then streams the runs back in
+sorted order with a k-way heap merge
+Run files are closed between writing and merging, and at most fan_in of
+them are open in one merge; with more runs, batches of them are first
+merged into longer runs, pass after pass, so the number of open files
+stays bounded however large the input is
+
+Usage: python poc_external_sort.py words.txt sorted.txt --run-size 1000000
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import shutil
+import tempfile
+
+import poc_sorted_lists
+
+# runs merged at a time, well below the usual open file limit
+FAN_IN = 100
+
+
+def read_words(lines):
+    """
+    Generator of the non-empty words of an iterable of lines
+    """
+    for line in lines:
+        word = line.rstrip("\r\n")
+        if word:
+            yield word
+
+
+def write_run(words, directory):
+    """
+    Write sorted words to a new file in directory
+    Returns the file name
+    """
+    handle, name = tempfile.mkstemp(suffix = ".run", dir = directory)
+    with os.fdopen(handle, "w") as run_file:
+        for word in words:
+            run_file.write(word + "\n")
+    return name
+
+
+def spill_runs(words, run_size, directory):
+    """
+    Sort words in runs of at most run_size and write each run to its own
+    file in directory
+    Returns the list of run file names
+    """
+    runs = []
+    words = iter(words)
+    while True:
+        run = sorted(itertools.islice(words, run_size))
+        if not run:
+            return runs
+        runs.append(write_run(run, directory))
+
+
+def merge_runs(runs):
+    """
+    Generator of the words of the named sorted run files, in sorted order
+    The files are open until the generator is exhausted or closed
+    """
+    run_files = []
+    try:
+        for name in runs:
+            run_files.append(open(name))
+        for word in heapq.merge(*[read_words(run_file) for run_file in run_files]):
+            yield word
+    finally:
+        for run_file in run_files:
+            run_file.close()
+
+
+def merge_passes(runs, directory, fan_in = FAN_IN):
+    """
+    Merge batches of at most fan_in run files into longer runs until no
+    more than fan_in are left, removing merged runs as they are used up
+    Returns the list of remaining run file names
+    """
+    assert fan_in >= 2, "fan_in must be at least 2"
+    while len(runs) > fan_in:
+        merged = []
+        for start in range(0, len(runs), fan_in):
+            batch = runs[start:start + fan_in]
+            merged.append(write_run(merge_runs(batch), directory))
+            for name in batch:
+                os.remove(name)
+        runs = merged
+    return runs
+
+
+def external_sort(words, run_size = 1000000, unique = False, fan_in = FAN_IN):
+    """
+    Generator of words in sorted order, holding at most run_size words
+    in memory and fan_in run files open at a time; with unique,
+    duplicates are dropped
+    The temporary run files are removed once the generator is exhausted
+    or closed
+    """
+    directory = tempfile.mkdtemp(prefix = "external_sort")
+    try:
+        runs = merge_passes(spill_runs(words, run_size, directory), directory, fan_in)
+        merged = merge_runs(runs)
+        try:
+            words = merged
+            if unique:
+                words = poc_sorted_lists.remove_duplicates(merged)
+            for word in words:
+                yield word
+        finally:
+            merged.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors = True)
+
+
+def sort_file(input_name, output_name, run_size = 1000000, unique = False,
+              fan_in = FAN_IN):
+    """
+    Sort the words of one file into another
+    """
+    with open(input_name) as input_file:
+        with open(output_name, "w") as output_file:
+            for word in external_sort(read_words(input_file), run_size, unique,
+                                      fan_in):
+                output_file.write(word + "\n")
+
+
+def main(argv = None):
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description = "Sort a word file larger than memory")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--run-size", type = int, default = 1000000,
+                        help = "words sorted in memory at a time")
+    parser.add_argument("--unique", action = "store_true",
+                        help = "drop duplicate words")
+    parser.add_argument("--fan-in", type = int, default = FAN_IN,
+                        help = "run files merged at a time")
+    args = parser.parse_args(argv)
+    sort_file(args.input, args.output, args.run_size, args.unique, args.fan_in)
+
+
+if __name__ == "__main__":
+    main()
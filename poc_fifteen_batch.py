@@ -0,0 +1,164 @@
+"""
+Batch solver for Fifteen puzzle instances
+Reads puzzles from a file, one JSON grid (a list of rows) per line,
+solves them on a process pool and streams one JSON line per puzzle:
+    {"index": 0, "length": 42, "seconds": 0.001, "solution": "lurd..."}
+A line that cannot be parsed or solved gets an error line instead,
+    {"index": 1, "error": "ValueError: unsolvable puzzle", "seconds": 0.0}
+so one bad instance never stops the batch
+Results come out in input order; at most a bounded number of chunks are
+in flight, so batches of any size run in constant memory
+
+Usage: python poc_fifteen_batch.py puzzles.jsonl --output solutions.jsonl
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import multiprocessing
+import sys
+import timeit
+
+import poc_fifteen_moves
+import week9_fifteen
+
+# move optimizer cache, kept for the lifetime of a worker process
+_MOVE_CACHE = {}
+
+
+def read_puzzles(lines):
+    """
+    Generator of (index, line) pairs for the non-blank lines of a file
+    The lines are parsed by the workers, see solve_line
+    """
+    index = 0
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield index, line
+            index += 1
+
+
+def check_grid(grid):
+    """
+    Raise ValueError unless grid is a non-empty rectangular list of rows
+    of integers
+    """
+    if not isinstance(grid, list) or not grid:
+        raise ValueError("grid is not a non-empty list of rows")
+    width = len(grid[0]) if isinstance(grid[0], list) else 0
+    for row in grid:
+        if not isinstance(row, list) or len(row) != width or not width:
+            raise ValueError("grid rows are not non-empty lists of equal length")
+        for tile in row:
+            if isinstance(tile, bool) or not isinstance(tile, int):
+                raise ValueError("grid holds a non-integer tile: " + json.dumps(tile))
+
+
+def solve_one(index, grid, window = None):
+    """
+    Solve one grid with Puzzle.solve_puzzle and return its result
+    dictionary; window, if given, is passed to
+    poc_fifteen_moves.optimize_moves
+    Any failure, from a malformed grid to an unsolvable board, gets an
+    "error" entry instead of a solution
+    """
+    start = timeit.default_timer()
+    try:
+        check_grid(grid)
+        puzzle = week9_fifteen.Puzzle(len(grid), len(grid[0]), grid)
+        solution = puzzle.solve_puzzle()
+        if window is not None:
+            solution = poc_fifteen_moves.optimize_moves(solution, window, _MOVE_CACHE)
+    except Exception as error:
+        return {"index": index,
+                "error": type(error).__name__ + ": " + str(error),
+                "seconds": timeit.default_timer() - start}
+    return {"index": index,
+            "length": len(solution),
+            "seconds": timeit.default_timer() - start,
+            "solution": solution}
+
+
+def solve_line(index, line, window = None):
+    """
+    Parse one JSON grid line and solve it with solve_one
+    A line that is not valid JSON gets an "error" entry
+    """
+    try:
+        grid = json.loads(line)
+    except ValueError as error:
+        return {"index": index, "error": "invalid JSON: " + str(error),
+                "seconds": 0.0}
+    return solve_one(index, grid, window)
+
+
+def solve_chunk(task):
+    """
+    Worker: solve a chunk of (index, line) pairs
+    task is a tuple (chunk, window)
+    Returns the list of result dictionaries, in chunk order
+    """
+    chunk, window = task
+    return [solve_line(index, line, window) for index, line in chunk]
+
+
+def solve_batch(puzzles, processes = None, chunksize = 16, window = None):
+    """
+    Generator that solves an iterable of (index, line) pairs on a process
+    pool and yields result dictionaries in input order
+    Input is consumed lazily: only a few chunks per worker are queued
+    ahead of the results being yielded
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    max_pending = 4 * processes
+    puzzles = iter(puzzles)
+    pool = multiprocessing.Pool(processes)
+    try:
+        pending = collections.deque()
+        while True:
+            chunk = list(itertools.islice(puzzles, chunksize))
+            if chunk:
+                pending.append(pool.apply_async(solve_chunk, ((chunk, window),)))
+            if not pending:
+                break
+            if len(pending) >= max_pending or not chunk:
+                for result in pending.popleft().get():
+                    yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main(argv = None):
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description = "Solve a batch of Fifteen puzzles")
+    parser.add_argument("puzzles", help = "file with one JSON grid per line")
+    parser.add_argument("--output", default = None,
+                        help = "JSON lines output file (default: standard output)")
+    parser.add_argument("--processes", type = int, default = None,
+                        help = "worker processes (default: one per core)")
+    parser.add_argument("--chunksize", type = int, default = 16,
+                        help = "puzzles sent to a worker at a time")
+    parser.add_argument("--optimize", type = int, default = None, metavar = "WINDOW",
+                        help = "post-optimize solutions with this window size")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output is None else open(args.output, "w")
+    try:
+        with open(args.puzzles) as puzzle_file:
+            for result in solve_batch(read_puzzles(puzzle_file), args.processes,
+                                      args.chunksize, args.optimize):
+                output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
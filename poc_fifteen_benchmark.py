@@ -0,0 +1,203 @@
+"""
+Benchmark suite for the Fifteen puzzle solver
+Times Puzzle.solve_puzzle, the replay of its solution with
+update_puzzle and the time spent in each phase method on seeded random
+boards, and reports move-string length and peak memory per board size
+
+Results can be saved as a baseline JSON file and later runs compared
+against it; the exit status is 1 when a timing or memory figure grew
+by more than the tolerance
+
+Usage: python poc_fifteen_benchmark.py --save-baseline baseline.json
+       python poc_fifteen_benchmark.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+    import resource
+
+import poc_fifteen_instances
+import week9_fifteen
+
+SIZES = ((3, 3), (4, 4), (5, 5), (10, 10), (20, 20), (50, 50), (100, 100))
+
+# phase methods timed separately; solve_puzzle calls each of them
+PHASES = ("solve_interior_tile", "solve_col0_tile", "solve_row1_tile",
+          "solve_row0_tile", "solve_2x2")
+
+# figures compared against the baseline, all lower-is-better
+COMPARED = ("solve_seconds", "replay_seconds", "peak_bytes")
+
+
+def time_phases(puzzle, phase_seconds, timer = timeit.default_timer):
+    """
+    Wrap the phase methods of one puzzle so that the time spent in each
+    is added to the phase_seconds dictionary
+    """
+    def timed(method, name):
+        """
+        Return a timing wrapper around a bound method
+        """
+        def wrapper(*args):
+            """
+            Call the method and record its running time
+            """
+            start = timer()
+            result = method(*args)
+            phase_seconds[name] += timer() - start
+            return result
+        return wrapper
+
+    for name in PHASES:
+        phase_seconds.setdefault(name, 0.0)
+        setattr(puzzle, name, timed(getattr(puzzle, name), name))
+
+
+def peak_memory(func):
+    """
+    Call func and return the peak memory it allocated in bytes
+    Without tracemalloc (Python 2) this falls back to the peak resident
+    size of the whole process, which only ever grows
+    """
+    if tracemalloc is None:
+        func()
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_size(height, width, seed = 0, repeat = 3, timer = timeit.default_timer):
+    """
+    Benchmark one board size and return a dictionary of results
+    Every repeat solves the same seeded board; the fastest solve and
+    replay are kept, and memory is measured in a separate, untimed run
+    """
+    grid = poc_fifteen_instances.random_grid(height, width, random.Random(seed))
+    best = {"solve_seconds": None, "replay_seconds": None}
+    for dummy_idx in range(repeat):
+        puzzle = week9_fifteen.Puzzle(height, width, grid)
+        phase_seconds = {}
+        time_phases(puzzle, phase_seconds, timer)
+        start = timer()
+        solution = puzzle.solve_puzzle()
+        solve_seconds = timer() - start
+        if best["solve_seconds"] is None or solve_seconds < best["solve_seconds"]:
+            best["solve_seconds"] = solve_seconds
+            best["phases"] = phase_seconds
+
+        replay = week9_fifteen.Puzzle(height, width, grid)
+        start = timer()
+        replay.update_puzzle(solution)
+        replay_seconds = timer() - start
+        if best["replay_seconds"] is None or replay_seconds < best["replay_seconds"]:
+            best["replay_seconds"] = replay_seconds
+
+    def solve():
+        """
+        Untimed solve used for the memory measurement
+        """
+        week9_fifteen.Puzzle(height, width, grid).solve_puzzle()
+
+    best["size"] = "%dx%d" % (height, width)
+    best["moves"] = len(solution)
+    best["solves_per_second"] = 1.0 / best["solve_seconds"]
+    best["replay_moves_per_second"] = (len(solution) / best["replay_seconds"]
+                                       if best["replay_seconds"] > 0 else None)
+    best["peak_bytes"] = peak_memory(solve)
+    return best
+
+
+def report(result):
+    """
+    Print the results for one board size
+    """
+    print("%-9s %9d moves %10.4f s solve %10.3g solves/s %12.0f replay moves/s %12d peak bytes"
+          % (result["size"], result["moves"], result["solve_seconds"],
+             result["solves_per_second"], result["replay_moves_per_second"] or 0,
+             result["peak_bytes"]))
+    print("          " + "  ".join("%s %.4f s" % (name, result["phases"][name])
+                                   for name in PHASES))
+
+
+def compare(results, baseline, tolerance = 1.25):
+    """
+    Compare results against a baseline dictionary keyed by board size
+    Returns a list of (size, figure, baseline value, new value) for
+    every figure that grew by more than the tolerance factor
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["size"])
+        if previous is None:
+            continue
+        for figure in COMPARED:
+            if result[figure] > previous[figure] * tolerance:
+                regressions.append((result["size"], figure,
+                                    previous[figure], result[figure]))
+    return regressions
+
+
+def parse_sizes(text):
+    """
+    Parse a comma separated list of HxW board sizes
+    """
+    sizes = []
+    for item in text.split(","):
+        height, width = item.lower().split("x")
+        sizes.append((int(height), int(width)))
+    return sizes
+
+
+def main(argv = None):
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description = "Benchmark the Fifteen puzzle solver")
+    parser.add_argument("--sizes", type = parse_sizes, default = SIZES,
+                        help = "comma separated board sizes, e.g. 3x3,10x10")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--baseline", default = None,
+                        help = "JSON file of earlier results to compare against")
+    parser.add_argument("--save-baseline", default = None,
+                        help = "write the results to this JSON file")
+    parser.add_argument("--tolerance", type = float, default = 1.25,
+                        help = "allowed growth factor before a figure is a regression")
+    args = parser.parse_args(argv)
+
+    results = []
+    for height, width in args.sizes:
+        result = bench_size(height, width, args.seed, args.repeat)
+        report(result)
+        results.append(result)
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump(dict((result["size"], result) for result in results),
+                      baseline_file, indent = 1, sort_keys = True)
+
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for size, figure, previous, current in regressions:
+            print("REGRESSION %s %s: %.6g -> %.6g" % (size, figure, previous, current))
+        if regressions:
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Bidirectional breadth first search for small Fifteen puzzles
+Searches forwards from the board and backwards from the solved board
+one layer at a time until the two searches meet, which gives shortest
+solutions for boards up to 3x3 and 2x4 in milliseconds
+
+Boards are packed into integers, BITS bits per cell in row-major order,
+and both searches share one visited dictionary whose values encode the
+side, the depth and the move that reached a state, so paths are rebuilt
+by undoing moves instead of storing parent states
+
+Usage: python poc_fifteen_bidir.py 3 3 --count 100 --seed 0
+"""
+
+import argparse
+import random
+import timeit
+
+import poc_fifteen_instances
+import poc_fifteen_moves
+
+BITS = 4
+MASK = (1 << BITS) - 1
+
+DIRECTIONS = "udlr"
+
+# sides of the search, stored in bit 2 of a visited entry
+FORWARD = 0
+BACKWARD = 1
+
+
+def pack(tiles):
+    """
+    Pack a flat tile list into an integer
+    """
+    state = 0
+    for tile in reversed(tiles):
+        state = (state << BITS) | tile
+    return state
+
+
+def unpack(state, size):
+    """
+    Unpack an integer into a flat tile list of the given size
+    """
+    tiles = []
+    for dummy_idx in range(size):
+        tiles.append(state & MASK)
+        state >>= BITS
+    return tiles
+
+
+def neighbor_table(height, width):
+    """
+    Return, for every blank position, the list of (move index, new blank
+    position) pairs, move index i standing for DIRECTIONS[i]
+    """
+    return [[(DIRECTIONS.index(direction), target) for direction, target in moves]
+            for moves in poc_fifteen_moves.blank_moves(height, width)]
+
+
+def slide(state, blank, target):
+    """
+    Return the packed state after the tile at target slides into the blank
+    """
+    tile = (state >> (BITS * target)) & MASK
+    return state - (tile << (BITS * target)) + (tile << (BITS * blank))
+
+
+def find_blank(state):
+    """
+    Return the position of the blank in a packed state
+    """
+    pos = 0
+    while state & MASK:
+        state >>= BITS
+        pos += 1
+    return pos
+
+
+def solve(height, width, tiles):
+    """
+    Return a shortest move string for a flat tile list
+    Raises ValueError for unsolvable boards and boards with more than
+    2 ** BITS cells
+    """
+    size = height * width
+    if size > 1 << BITS:
+        raise ValueError("board too large to pack: " + str(size) + " cells")
+    if not poc_fifteen_instances.is_solvable(width, tiles):
+        raise ValueError("unsolvable puzzle")
+    start = pack(tiles)
+    goal = pack(range(size))
+    if start == goal:
+        return ""
+    table = neighbor_table(height, width)
+    inverse = [DIRECTIONS.index(poc_fifteen_moves.INVERSE[direction])
+               for direction in DIRECTIONS]
+
+    # visited[state] = depth << 3 | side << 2 | move index; the roots
+    # store move index 0 and are recognized by depth 0
+    visited = {start: FORWARD << 2, goal: BACKWARD << 2}
+    frontiers = [[(start, tiles.index(0))], [(goal, 0)]]
+    depths = [0, 0]
+    while True:
+        side = FORWARD if len(frontiers[FORWARD]) <= len(frontiers[BACKWARD]) else BACKWARD
+        depth = depths[side] + 1
+        code = (depth << 3) | (side << 2)
+        best = None
+        next_frontier = []
+        for state, blank in frontiers[side]:
+            for move, target in table[blank]:
+                child = slide(state, blank, target)
+                entry = visited.get(child)
+                if entry is None:
+                    visited[child] = code | move
+                    next_frontier.append((child, target))
+                elif (entry >> 2) & 1 != side:
+                    total = depth + (entry >> 3)
+                    if best is None or total < best[0]:
+                        best = (total, state, move, child)
+        if best is not None:
+            dummy_total, state, move, child = best
+            if side == FORWARD:
+                return _path(visited, state, table, inverse) + DIRECTIONS[move] + \
+                    _path(visited, child, table, inverse)
+            return _path(visited, child, table, inverse) + DIRECTIONS[inverse[move]] + \
+                _path(visited, state, table, inverse)
+        frontiers[side] = next_frontier
+        depths[side] = depth
+
+
+def _path(visited, state, table, inverse):
+    """
+    Rebuild the moves between a root and a visited state by undoing the
+    stored moves: for a forward state the moves from the start to it,
+    for a backward state the moves from it to the goal
+    """
+    moves = []
+    entry = visited[state]
+    side = (entry >> 2) & 1
+    while entry >> 3:
+        move = entry & 3
+        blank = find_blank(state)
+        # the blank came into its cell with move, so it left from the
+        # cell in the opposite direction
+        target = [target for index, target in table[blank] if index == inverse[move]][0]
+        state = slide(state, blank, target)
+        if side == FORWARD:
+            moves.append(DIRECTIONS[move])
+        else:
+            moves.append(DIRECTIONS[inverse[move]])
+        entry = visited[state]
+    if side == FORWARD:
+        moves.reverse()
+    return "".join(moves)
+
+
+def main(argv = None):
+    """
+    Command line entry point: compare shortest solutions with
+    Puzzle.solve_puzzle on seeded random boards
+    """
+    import week9_fifteen
+
+    parser = argparse.ArgumentParser(description = "Bidirectional BFS Fifteen solver")
+    parser.add_argument("height", type = int)
+    parser.add_argument("width", type = int)
+    parser.add_argument("--count", type = int, default = 100)
+    parser.add_argument("--seed", type = int, default = 0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    timer = timeit.default_timer
+    totals = {"bidir": [0, 0.0], "solve_puzzle": [0, 0.0]}
+    for dummy_idx in range(args.count):
+        grid = poc_fifteen_instances.random_grid(args.height, args.width, rng)
+        start = timer()
+        puzzle = week9_fifteen.Puzzle(args.height, args.width, grid)
+        moves = puzzle.solve_bidirectional()
+        totals["bidir"][0] += len(moves)
+        totals["bidir"][1] += timer() - start
+        start = timer()
+        moves = week9_fifteen.Puzzle(args.height, args.width, grid).solve_puzzle()
+        totals["solve_puzzle"][0] += len(moves)
+        totals["solve_puzzle"][1] += timer() - start
+    for name in ("bidir", "solve_puzzle"):
+        length, seconds = totals[name]
+        print("%-13s mean length %8.2f  mean time %10.6f s"
+              % (name, float(length) / args.count, seconds / args.count))
+
+
+if __name__ == "__main__":
+    main()
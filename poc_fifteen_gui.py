@@ -25,6 +25,8 @@ class FifteenGUI:
                                              self._puzzle_width * TILE_SIZE,
                                              self._puzzle_height * TILE_SIZE)
         self._solution = ""
+        # move strings still to be displayed after self._solution
+        self._chunks = iter(())
         self._current_moves = ""
         self._frame.add_button("Solve", self.solve, 100)
         self._frame.add_input("Enter moves", self.enter_moves, 100)
@@ -39,8 +41,11 @@ class FifteenGUI:
         """
         Timer for incrementally displaying computed solution
         """
-        if self._solution == "":
-            return
+        while self._solution == "":
+            self._solution = next(self._chunks, None)
+            if self._solution is None:
+                self._solution = ""
+                return
         direction = self._solution[0]
         self._solution = self._solution[1:]
         try:
@@ -53,7 +58,12 @@ class FifteenGUI:
         Event handler to generate solution string for given configuration
         """
         new_puzzle = self._puzzle.clone()
-        self._solution = new_puzzle.solve_puzzle()
+        try:
+            self._chunks = new_puzzle.iter_solve_puzzle()
+        except ValueError:
+            print "unsolvable puzzle"
+            return
+        self._solution = ""
 
     def print_moves(self):
         """
@@ -67,6 +77,7 @@ class FifteenGUI:
         Event handler to enter move string
         """
         self._solution = txt
+        self._chunks = iter(())
 
     def keydown(self, key):
         """
@@ -0,0 +1,261 @@
+"""
+Optimal Fifteen puzzle solver
+Iterative deepening A* (IDA*) over flat tile lists, guided by
+max(Manhattan distance + linear conflicts, sum of additive pattern
+databases); both heuristics are admissible so solutions are optimal
+With a weight w > 1 the search orders by cost + w * heuristic instead
+and returns solutions at most w times longer than optimal, much sooner;
+that is the practical mode for 5x5 boards
+
+Boards use the Puzzle conventions: the solved configuration has tile t
+at flat position t (blank in the upper left) and a move letter names
+the direction the blank moves in
+"""
+
+import poc_fifteen_instances
+import poc_fifteen_moves
+import poc_fifteen_pdb
+
+# tile groups used when no partition is given
+DEFAULT_PARTITIONS = {(3, 3): ((1, 2, 3, 4), (5, 6, 7, 8)),
+                      (4, 4): ((1, 2, 3, 5, 6), (4, 8, 9, 12, 13),
+                               (7, 10, 11, 14, 15)),
+                      (5, 5): ((1, 2, 5, 6), (3, 4, 8, 9), (7, 12, 13, 14),
+                               (10, 11, 15, 16), (17, 20, 21, 22),
+                               (18, 19, 23, 24))}
+
+
+def longest_increasing(values):
+    """
+    Return the length of the longest strictly increasing subsequence
+    """
+    tails = []
+    for value in values:
+        low, high = 0, len(tails)
+        while low < high:
+            mid = (low + high) // 2
+            if tails[mid] < value:
+                low = mid + 1
+            else:
+                high = mid
+        if low == len(tails):
+            tails.append(value)
+        else:
+            tails[low] = value
+    return len(tails)
+
+
+class Solver:
+    """
+    IDA* solver for one board size
+    """
+
+    def __init__(self, height, width, databases = ()):
+        """
+        Create a solver; databases is a sequence of
+        poc_fifteen_pdb.PatternDatabase over disjoint tile groups
+        """
+        self._height = height
+        self._width = width
+        self._databases = list(databases)
+        size = height * width
+        # database index and key weight of every tile, if covered
+        self._group = [None] * size
+        for group, database in enumerate(self._databases):
+            for idx, tile in enumerate(database.get_tiles()):
+                self._group[tile] = (group, size ** idx)
+        self._moves = poc_fifteen_moves.blank_moves(height, width)
+
+    def manhattan(self, tiles):
+        """
+        Return the summed Manhattan distance of all non-blank tiles
+        """
+        width = self._width
+        total = 0
+        for pos, tile in enumerate(tiles):
+            if tile:
+                total += (abs(pos // width - tile // width) +
+                          abs(pos % width - tile % width))
+        return total
+
+    def row_conflicts(self, tiles, row):
+        """
+        Linear conflict penalty of one row: two moves for every tile
+        that has to leave the row to let the others pass
+        """
+        width = self._width
+        goals = [tile % width for tile in tiles[row * width:(row + 1) * width]
+                 if tile and tile // width == row]
+        return 2 * (len(goals) - longest_increasing(goals))
+
+    def col_conflicts(self, tiles, col):
+        """
+        Linear conflict penalty of one column
+        """
+        width = self._width
+        goals = [tile // width for tile in tiles[col::width]
+                 if tile and tile % width == col]
+        return 2 * (len(goals) - longest_increasing(goals))
+
+    def linear_conflicts(self, tiles):
+        """
+        Return the total linear conflict penalty of a board
+        """
+        return (sum(self.row_conflicts(tiles, row) for row in range(self._height)) +
+                sum(self.col_conflicts(tiles, col) for col in range(self._width)))
+
+    def database_keys(self, tiles):
+        """
+        Return the current key of every pattern database
+        """
+        keys = [0] * len(self._databases)
+        for pos, tile in enumerate(tiles):
+            if self._group[tile] is not None:
+                group, weight = self._group[tile]
+                keys[group] += pos * weight
+        return keys
+
+    def heuristic(self, tiles):
+        """
+        Return the heuristic estimate of a board
+        """
+        estimate = self.manhattan(tiles) + self.linear_conflicts(tiles)
+        keys = self.database_keys(tiles)
+        additive = sum(database.lookup(key) for database, key in zip(self._databases, keys))
+        return max(estimate, additive)
+
+    def group_manhattan(self, tiles):
+        """
+        Return the summed Manhattan distance of the tiles of each database
+        """
+        width = self._width
+        totals = [0] * len(self._databases)
+        for pos, tile in enumerate(tiles):
+            if self._group[tile] is not None:
+                totals[self._group[tile][0]] += (abs(pos // width - tile // width) +
+                                                 abs(pos % width - tile % width))
+        return totals
+
+    def solve(self, tiles, weight = 1):
+        """
+        Return an optimal move string for a flat tile list, or with
+        weight > 1 one at most weight times longer than optimal
+        Raises ValueError for unsolvable boards, on which the search
+        would raise its bound forever
+        """
+        if not poc_fifteen_instances.is_solvable(self._width, tiles):
+            raise ValueError("unsolvable puzzle")
+        tiles = list(tiles)
+        blank = tiles.index(0)
+        width = self._width
+        height = self._height
+        moves = self._moves
+        group = self._group
+        databases = self._databases
+        row_conflicts = self.row_conflicts
+        col_conflicts = self.col_conflicts
+
+        manhattan = [self.manhattan(tiles)]
+        rows = [row_conflicts(tiles, row) for row in range(height)]
+        cols = [col_conflicts(tiles, col) for col in range(width)]
+        conflicts = [sum(rows) + sum(cols)]
+        # the database sum is kept as the Manhattan distance of the covered
+        # tiles plus the stored excess of each database
+        keys = self.database_keys(tiles)
+        additive = [sum(self.group_manhattan(tiles)) +
+                    sum(database.excess(key) for database, key in zip(databases, keys))]
+        path = []
+
+        def estimate():
+            """
+            Heuristic of the current board
+            """
+            return max(manhattan[0] + conflicts[0], additive[0])
+
+        def apply_move(blank, target):
+            """
+            Slide the tile at target into the blank, updating the
+            heuristic components; returns the tile moved
+            """
+            tile = tiles[target]
+            tiles[blank] = tile
+            tiles[target] = 0
+            tile_row, tile_col = divmod(tile, width)
+            old_row, old_col = divmod(target, width)
+            new_row, new_col = divmod(blank, width)
+            change = (abs(new_row - tile_row) + abs(new_col - tile_col) -
+                      abs(old_row - tile_row) - abs(old_col - tile_col))
+            manhattan[0] += change
+            if old_row != new_row:
+                for row in (old_row, new_row):
+                    value = row_conflicts(tiles, row)
+                    conflicts[0] += value - rows[row]
+                    rows[row] = value
+            else:
+                for col in (old_col, new_col):
+                    value = col_conflicts(tiles, col)
+                    conflicts[0] += value - cols[col]
+                    cols[col] = value
+            if group[tile] is not None:
+                index, key_weight = group[tile]
+                database = databases[index]
+                additive[0] += change - database.excess(keys[index])
+                keys[index] += (blank - target) * key_weight
+                additive[0] += database.excess(keys[index])
+            return tile
+
+        def search(blank, cost, bound, previous):
+            """
+            Depth-first search below bound; returns the smallest f value
+            that exceeded it, or -1 once the board is solved
+            """
+            total = cost + weight * estimate()
+            if total > bound:
+                return total
+            if manhattan[0] == 0:
+                return -1
+            smallest = None
+            for direction, target in moves[blank]:
+                if direction == previous:
+                    continue
+                apply_move(blank, target)
+                path.append(direction)
+                result = search(target, cost + 1, bound, poc_fifteen_moves.INVERSE[direction])
+                if result == -1:
+                    return -1
+                path.pop()
+                apply_move(target, blank)
+                if smallest is None or result < smallest:
+                    smallest = result
+            return smallest
+
+        bound = weight * estimate()
+        while True:
+            result = search(blank, 0, bound, None)
+            if result == -1:
+                return "".join(path)
+            bound = result
+
+
+def default_databases(height, width, directory = "."):
+    """
+    Load (building and persisting on first use) the default pattern
+    databases for a board size; boards without a default partition get
+    none and are searched with Manhattan distance and linear conflicts
+    """
+    partition = DEFAULT_PARTITIONS.get((height, width), ())
+    return [poc_fifteen_pdb.load_or_build(height, width, tiles, directory)
+            for tiles in partition]
+
+
+def solve(height, width, tiles, databases = None, directory = ".", weight = 1):
+    """
+    Return an optimal move string for a height x width board given as a
+    flat tile list (see Solver.solve for weight); databases default to
+    default_databases, which are read from (and on first use built and
+    written to) directory
+    Raises ValueError for unsolvable boards
+    """
+    if databases is None:
+        databases = default_databases(height, width, directory)
+    return Solver(height, width, databases).solve(tiles, weight)
@@ -0,0 +1,98 @@
+"""
+Solvability check and random instances for the Fifteen puzzle
+Boards are flat tile lists in row-major order; the solved configuration
+has tile t at position t (blank in the upper left)
+
+Every move swaps the blank with a neighbor, which flips both the parity
+of the tile permutation and the parity of the blank's row + column, so
+a board is solvable exactly when the two parities agree
+On a single row or column tiles cannot pass each other, so there the
+board is solvable exactly when the non-blank tiles are already in order
+
+Usage: python poc_fifteen_instances.py 4 4 1000 --seed 0 > puzzles.jsonl
+"""
+
+import argparse
+import json
+import random
+
+
+def permutation_parity(tiles):
+    """
+    Return 0 for an even permutation of range(len(tiles)), 1 for an odd
+    one; counts cycles in O(N) rather than counting inversions
+    Raises ValueError if tiles is not such a permutation
+    """
+    size = len(tiles)
+    if sorted(tiles) != list(range(size)):
+        raise ValueError("tiles are not a permutation of 0.." + str(size - 1))
+    seen = bytearray(size)
+    cycles = 0
+    for start in range(size):
+        if not seen[start]:
+            cycles += 1
+            pos = start
+            while not seen[pos]:
+                seen[pos] = 1
+                pos = tiles[pos]
+    return (size - cycles) % 2
+
+
+def is_solvable(width, tiles):
+    """
+    Return whether the flat board tiles of the given width can be solved
+    Raises ValueError if tiles is not a permutation of range(len(tiles))
+    """
+    parity = permutation_parity(tiles)
+    if width < 2 or len(tiles) <= width:
+        return [tile for tile in tiles if tile] == list(range(1, len(tiles)))
+    zero_row, zero_col = divmod(tiles.index(0), width)
+    return parity == (zero_row + zero_col) % 2
+
+
+def random_tiles(height, width, rng = random):
+    """
+    Return a uniformly random solvable flat board
+    A shuffle that comes out unsolvable is fixed by swapping two non-blank
+    tiles, which maps the unsolvable boards one-to-one onto solvable ones
+    On a single row or column only the blank's position is random
+    """
+    if height < 2 or width < 2:
+        tiles = list(range(1, height * width))
+        tiles.insert(rng.randrange(height * width), 0)
+        return tiles
+    tiles = list(range(height * width))
+    rng.shuffle(tiles)
+    if not is_solvable(width, tiles):
+        first, second = [pos for pos in range(3) if tiles[pos] != 0][:2]
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+    return tiles
+
+
+def random_grid(height, width, rng = random):
+    """
+    Return a uniformly random solvable board as a list of rows, the
+    format taken by Puzzle
+    """
+    tiles = random_tiles(height, width, rng)
+    return [tiles[row * width:(row + 1) * width] for row in range(height)]
+
+
+def main(argv = None):
+    """
+    Command line entry point: print random solvable boards as JSON lines
+    """
+    parser = argparse.ArgumentParser(description = "Generate random Fifteen puzzles")
+    parser.add_argument("height", type = int)
+    parser.add_argument("width", type = int)
+    parser.add_argument("count", type = int)
+    parser.add_argument("--seed", type = int, default = None)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for dummy_idx in range(args.count):
+        print(json.dumps(random_grid(args.height, args.width, rng)))
+
+
+if __name__ == "__main__":
+    main()
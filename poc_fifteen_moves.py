@@ -0,0 +1,214 @@
+"""
+Move string utilities for the Fifteen puzzle
+A move letter names the direction the blank moves in
+Includes a post-optimizer that shortens solver output without changing
+the configuration it produces
+"""
+
+INVERSE = {"u": "d", "d": "u", "l": "r", "r": "l"}
+STEPS = {"u": (-1, 0), "d": (1, 0), "l": (0, -1), "r": (0, 1)}
+
+
+def blank_moves(height, width):
+    """
+    Return, for every flat position of a height x width board, the list
+    of (direction, new position) pairs of the blank's moves from there,
+    in "udlr" order
+    """
+    table = []
+    for pos in range(height * width):
+        row, col = divmod(pos, width)
+        moves = []
+        for direction in "udlr":
+            d_row, d_col = STEPS[direction]
+            if 0 <= row + d_row < height and 0 <= col + d_col < width:
+                moves.append((direction, pos + d_row * width + d_col))
+        table.append(moves)
+    return table
+
+
+def reverse_moves(moves):
+    """
+    Return the move string that undoes moves
+    """
+    return "".join(INVERSE[direction] for direction in reversed(moves))
+
+
+def cancel_inverses(moves):
+    """
+    Remove immediately cancelling pairs such as "lr" and "ud", repeatedly,
+    so "ruld" + "dlur" style round trips collapse completely
+    """
+    stack = []
+    for direction in moves:
+        if stack and stack[-1] == INVERSE[direction]:
+            stack.pop()
+        else:
+            stack.append(direction)
+    return "".join(stack)
+
+
+# compiled macros keyed by (moves, width)
+_MACROS = {}
+
+
+def _trace(moves):
+    """
+    Follow the blank along a move string from (0, 0)
+    Returns a dictionary mapping every relative cell the blank visits to
+    the relative cell its final content came from
+    """
+    row, col = 0, 0
+    content = {(0, 0): (0, 0)}
+    for direction in moves:
+        d_row, d_col = STEPS[direction]
+        target = (row + d_row, col + d_col)
+        content[(row, col)] = content.get(target, target)
+        content[target] = (0, 0)
+        row, col = target
+    return content
+
+
+def compile_macro(moves, width):
+    """
+    Return the net effect of a move string on a board of the given width
+    as (min_row, max_row, min_col, max_col, dests, sources), all relative
+    to the blank's starting cell: the row and column range the blank
+    visits, and the flat offsets of every cell whose content changes
+    (the blank included) with the offsets the contents come from
+    Results are cached, since the solver applies a few macros
+    many times
+    """
+    key = (moves, width)
+    if key in _MACROS:
+        return _MACROS[key]
+    content = _trace(moves)
+    changed = [(cell, source) for cell, source in content.items() if cell != source]
+    macro = (min(cell[0] for cell in content), max(cell[0] for cell in content),
+             min(cell[1] for cell in content), max(cell[1] for cell in content),
+             tuple(cell[0] * width + cell[1] for cell, dummy_source in changed),
+             tuple(source[0] * width + source[1] for dummy_cell, source in changed))
+    _MACROS[key] = macro
+    return macro
+
+
+def window_effect(moves):
+    """
+    Describe what a move string does to the cells it touches
+    Returns (box_height, box_width, start, arrangement): the bounding box
+    of the blank's path, the blank's starting index in the box
+    (row-major) and, for every box cell, the index of the cell its final
+    content came from
+    """
+    content = _trace(moves)
+    min_row = min(cell[0] for cell in content)
+    min_col = min(cell[1] for cell in content)
+    box_height = max(cell[0] for cell in content) - min_row + 1
+    box_width = max(cell[1] for cell in content) - min_col + 1
+
+    def box_index(cell):
+        """
+        Row-major index of a relative cell inside the box
+        """
+        return (cell[0] - min_row) * box_width + cell[1] - min_col
+
+    arrangement = list(range(box_height * box_width))
+    for cell, source in content.items():
+        arrangement[box_index(cell)] = box_index(source)
+    return box_height, box_width, box_index((0, 0)), tuple(arrangement)
+
+
+def _expand(frontier, parents, box_moves):
+    """
+    Expand one BFS layer of (state, blank) pairs, recording for every new
+    state its parent state and the move leading to it
+    Returns the next layer
+    """
+    next_frontier = []
+    for state, blank in frontier:
+        for direction, target in box_moves[blank]:
+            child = list(state)
+            child[blank], child[target] = child[target], child[blank]
+            child = tuple(child)
+            if child not in parents:
+                parents[child] = (state, direction)
+                next_frontier.append((child, target))
+    return next_frontier
+
+
+def shortest_equivalent(box_height, box_width, start, arrangement, limit):
+    """
+    Bidirectional BFS inside the box for the shortest move string with
+    the given effect; returns it if it is shorter than limit, else None
+    """
+    identity = tuple(range(box_height * box_width))
+    if arrangement == identity:
+        return ""
+    box_moves = blank_moves(box_height, box_width)
+    forward = {identity: None}
+    backward = {arrangement: None}
+    forward_frontier = [(identity, start)]
+    backward_frontier = [(arrangement, arrangement.index(start))]
+    depth = 0
+    while depth + 1 < limit and forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier = _expand(forward_frontier, forward, box_moves)
+            layer, other = forward_frontier, backward
+        else:
+            backward_frontier = _expand(backward_frontier, backward, box_moves)
+            layer, other = backward_frontier, forward
+        depth += 1
+        for state, dummy_blank in layer:
+            if state in other:
+                return _join_paths(forward, backward, state)
+    return None
+
+
+def _join_paths(forward, backward, meeting):
+    """
+    Rebuild the move string through the state where the searches met
+    """
+    head = []
+    state = meeting
+    while forward[state] is not None:
+        state, direction = forward[state]
+        head.append(direction)
+    tail = []
+    state = meeting
+    while backward[state] is not None:
+        state, direction = backward[state]
+        tail.append(INVERSE[direction])
+    return "".join(reversed(head)) + "".join(tail)
+
+
+def optimize_moves(moves, window = 0, cache = None):
+    """
+    Return a move string with the same end state as moves, no longer than it
+    Immediately cancelling pairs are always removed; with window > 0,
+    every run of window moves is also replaced by the shortest move
+    string with the same effect on the cells it touches, if shorter
+    cache is an optional dictionary shared between calls, since solver
+    output repeats the same macros many times; entries are keyed by the
+    window too, as a replacement is only searched below the window size
+    """
+    moves = cancel_inverses(moves)
+    if window < 2:
+        return moves
+    if cache is None:
+        cache = {}
+    moves = list(moves)
+    pos = 0
+    while pos + window <= len(moves):
+        effect = window_effect(moves[pos:pos + window])
+        key = (effect, window)
+        if key not in cache:
+            cache[key] = shortest_equivalent(effect[0], effect[1], effect[2],
+                                             effect[3], window)
+        replacement = cache[key]
+        if replacement is None:
+            pos += 1
+            continue
+        moves[pos:pos + window] = list(replacement)
+        # look back so that the shorter string can combine with what precedes it
+        pos = max(0, pos - window)
+    return cancel_inverses("".join(moves))
@@ -0,0 +1,239 @@
+"""
+Additive pattern databases for the Fifteen puzzle
+A database covers a group of tiles and stores, for every placement of
+those tiles, the fewest moves of group tiles needed to bring them home
+(moves of the blank over other tiles are free), so that the values of
+disjoint groups can be added into an admissible heuristic
+
+The solved configuration has tile t at flat position t (blank at 0)
+
+Databases are built once by this module's command line tool and written
+to a binary file; solvers open the file with mmap so that every process
+shares one copy of the table and starts without loading it
+
+Usage: python poc_fifteen_pdb.py 4 4 1,2,3,5,6,9 4,7,8,10,11,12 13,14,15
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+import poc_fifteen_moves
+
+MAGIC = b"PDB1"
+# magic, height, width, number of tiles
+HEADER = struct.Struct("<4sBBB")
+
+# a stored nibble holds (cost - manhattan) / 2, which is always an
+# integer since every tile move changes the Manhattan distance by one;
+# larger excesses are clamped, which keeps the heuristic admissible
+MAX_NIBBLE = 15
+
+if bytes is str:
+    # Python 2: mmap items are one-character strings
+    _mmap_byte = ord
+else:
+    _mmap_byte = int
+
+
+def placement_manhattan(key, size, width, tiles):
+    """
+    Return the summed Manhattan distance of the group tiles for a key
+    """
+    total = 0
+    for tile in tiles:
+        key, pos = divmod(key, size)
+        total += abs(pos // width - tile // width) + abs(pos % width - tile % width)
+    return total
+
+
+class PatternDatabase:
+    """
+    Pattern database for one group of tiles on a height x width board
+    A placement is keyed by sum(position[i] * size ** i) over the group
+    tiles, size being height * width; the table packs two keys per byte
+    (low nibble for even keys) starting at byte offset
+    """
+
+    def __init__(self, height, width, tiles, table, offset = 0):
+        """
+        Wrap an existing packed table; use build or load to create one
+        """
+        self._height = height
+        self._width = width
+        self._tiles = tuple(tiles)
+        self._table = table
+        self._offset = offset
+        if isinstance(table, mmap.mmap):
+            self._byte = _mmap_byte
+        else:
+            self._byte = int
+
+    def get_tiles(self):
+        """
+        Return the tuple of tiles covered by the database
+        """
+        return self._tiles
+
+    def key(self, positions):
+        """
+        Return the table key for the flat positions of the group tiles
+        """
+        size = self._height * self._width
+        key = 0
+        for pos in reversed(positions):
+            key = key * size + pos
+        return key
+
+    def excess(self, key):
+        """
+        Return the stored cost for a placement key minus the Manhattan
+        distance of its tiles
+        """
+        value = self._byte(self._table[self._offset + (key >> 1)])
+        if key & 1:
+            value >>= 4
+        return 2 * (value & 0xF)
+
+    def lookup(self, key):
+        """
+        Return the stored cost for a placement key
+        """
+        return (placement_manhattan(key, self._height * self._width,
+                                    self._width, self._tiles) + self.excess(key))
+
+    @classmethod
+    def build(cls, height, width, tiles):
+        """
+        Build the database with a breadth first search backwards from the
+        solved placement
+        Free blank moves are folded into the states: a state is a
+        placement plus the region of non-group cells the blank can roam,
+        named by its smallest cell, so every search edge moves a group tile
+        """
+        size = height * width
+        num_tiles = len(tiles)
+        weights = [size ** idx for idx in range(num_tiles)]
+        num_keys = size ** num_tiles
+        neighbors = [[target for dummy_direction, target in moves]
+                     for moves in poc_fifteen_moves.blank_moves(height, width)]
+
+        table = bytearray(num_keys // 2 + 1)
+        placed = bytearray(num_keys // 8 + 1)
+        visited = bytearray(num_keys * size // 8 + 1)
+
+        frontier = [(sum(tile * weight for tile, weight in zip(tiles, weights)), 0)]
+        cost = 0
+        while frontier:
+            next_frontier = []
+            append = next_frontier.append
+            for key, blank in frontier:
+                # decode which group tile (if any) sits on each cell
+                occupant = {}
+                rest = key
+                for idx in range(num_tiles):
+                    rest, pos = divmod(rest, size)
+                    occupant[pos] = idx
+
+                region = [blank]
+                seen = set(region)
+                for cell in region:
+                    for neighbor in neighbors[cell]:
+                        if neighbor not in seen and neighbor not in occupant:
+                            seen.add(neighbor)
+                            region.append(neighbor)
+                state = key * size + min(region)
+                if visited[state >> 3] & (1 << (state & 7)):
+                    continue
+                visited[state >> 3] |= 1 << (state & 7)
+
+                if not placed[key >> 3] & (1 << (key & 7)):
+                    placed[key >> 3] |= 1 << (key & 7)
+                    value = (cost - placement_manhattan(key, size, width, tiles)) // 2
+                    value = min(value, MAX_NIBBLE)
+                    if key & 1:
+                        table[key >> 1] |= value << 4
+                    else:
+                        table[key >> 1] |= value
+
+                for cell in region:
+                    for neighbor in neighbors[cell]:
+                        if neighbor in occupant:
+                            append((key + (cell - neighbor) * weights[occupant[neighbor]],
+                                    neighbor))
+            frontier = next_frontier
+            cost += 1
+        return cls(height, width, tiles, table)
+
+    def save(self, filename):
+        """
+        Write the header and the packed table to a binary file
+        """
+        with open(filename, "wb") as table_file:
+            table_file.write(HEADER.pack(MAGIC, self._height, self._width,
+                                         len(self._tiles)))
+            table_file.write(bytearray(self._tiles))
+            table_file.write(self._table[self._offset:])
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Open a file written by save as a read-only memory map
+        Raises ValueError for a file that is not a complete database
+        """
+        with open(filename, "rb") as table_file:
+            if not os.fstat(table_file.fileno()).st_size:
+                raise ValueError("not a pattern database: " + filename)
+            table = mmap.mmap(table_file.fileno(), 0, access = mmap.ACCESS_READ)
+        if len(table) < HEADER.size or table[:len(MAGIC)] != MAGIC:
+            table.close()
+            raise ValueError("not a pattern database: " + filename)
+        dummy_magic, height, width, num_tiles = HEADER.unpack(table[:HEADER.size])
+        offset = HEADER.size + num_tiles
+        if len(table) - offset != (height * width) ** num_tiles // 2 + 1:
+            table.close()
+            raise ValueError("pattern database of the wrong size: " + filename)
+        tiles = [_mmap_byte(table[HEADER.size + idx]) for idx in range(num_tiles)]
+        return cls(height, width, tiles, table, offset)
+
+
+def database_filename(directory, height, width, tiles):
+    """
+    Return the file name used to persist a database
+    """
+    name = "pdb_%dx%d_%s.bin" % (height, width, "-".join(str(tile) for tile in tiles))
+    return os.path.join(directory, name)
+
+
+def load_or_build(height, width, tiles, directory = "."):
+    """
+    Open a persisted database, building and saving it on first use
+    """
+    filename = database_filename(directory, height, width, tiles)
+    if not os.path.exists(filename):
+        PatternDatabase.build(height, width, tiles).save(filename)
+    return PatternDatabase.load(filename)
+
+
+def main(argv = None):
+    """
+    Command line entry point: build and save one database per tile group
+    """
+    parser = argparse.ArgumentParser(description = "Build Fifteen puzzle pattern databases")
+    parser.add_argument("height", type = int)
+    parser.add_argument("width", type = int)
+    parser.add_argument("groups", nargs = "+",
+                        help = "comma separated tiles of each disjoint group")
+    parser.add_argument("--directory", default = ".")
+    args = parser.parse_args(argv)
+
+    for group in args.groups:
+        tiles = [int(tile) for tile in group.split(",")]
+        filename = database_filename(args.directory, args.height, args.width, tiles)
+        PatternDatabase.build(args.height, args.width, tiles).save(filename)
+        print("wrote " + filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -115,3 +115,139 @@ class Grid:
         """
         return (point[1] / cell_size, point[0] / cell_size) 
 
+
+# neighbor directions as (row offset, col offset) in the order used by
+# Grid.four_neighbors and Grid.eight_neighbors
+FOUR_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+EIGHT_DIRECTIONS = FOUR_DIRECTIONS + ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+class FlatGrid(Grid):
+    """
+    Array-backed 2D grid of cells
+    Cells are stored row-major in one contiguous bytearray (one byte per
+    cell) and addressed by flat index = row * width + col
+    Each cell also has a precomputed byte whose bits record which of the
+    eight neighbor directions stay on the grid; code that walks flat
+    indices reads it with the offset tables (see neighbor_offsets)
+    """
+
+    def __init__(self, grid_height, grid_width):
+        """
+        Initializes grid to be empty, take height and width of grid as parameters
+        """
+        self._grid_height = grid_height
+        self._grid_width = grid_width
+        self._cells = bytearray(grid_height * grid_width)
+
+        # offset tables: (direction bit, row offset, col offset, flat offset)
+        self._eight_offsets = tuple((1 << bit, d_row, d_col, d_row * grid_width + d_col)
+                                    for bit, (d_row, d_col) in enumerate(EIGHT_DIRECTIONS))
+        self._four_offsets = self._eight_offsets[:4]
+        self._neighbor_mask = self._build_neighbor_mask()
+        self._four_table = self._build_offset_table(self._four_offsets)
+        self._eight_table = self._build_offset_table(self._eight_offsets)
+
+    def _build_neighbor_mask(self):
+        """
+        Compute the direction bits of every cell, one row pattern at a time
+        """
+        height = self._grid_height
+        width = self._grid_width
+
+        def row_pattern(row):
+            """
+            Direction bits for every column of a row
+            """
+            pattern = bytearray(width)
+            for col in range(width):
+                bits = 0
+                for bit, d_row, d_col, dummy_delta in self._eight_offsets:
+                    if 0 <= row + d_row < height and 0 <= col + d_col < width:
+                        bits |= bit
+                pattern[col] = bits
+            return pattern
+
+        if height == 1:
+            return row_pattern(0)
+        return (row_pattern(0) + row_pattern(1) * (height - 2) +
+                row_pattern(height - 1))
+
+    @staticmethod
+    def _build_offset_table(offsets):
+        """
+        Map every possible byte of direction bits to its flat offsets
+        """
+        return tuple(tuple(delta for bit, dummy_row, dummy_col, delta in offsets
+                           if bits & bit)
+                     for bits in range(256))
+
+    def __str__(self):
+        """
+        Return multi-line string represenation for grid
+        """
+        width = self._grid_width
+        ans = ""
+        for row in range(self._grid_height):
+            ans += str(list(self._cells[row * width:(row + 1) * width]))
+            ans += "\n"
+        return ans
+
+    def get_cells(self):
+        """
+        Return the underlying row-major bytearray of cells
+        The buffer is updated in place, so references stay valid
+        """
+        return self._cells
+
+    def index(self, row, col):
+        """
+        Return the flat index of cell (row, col)
+        """
+        return row * self._grid_width + col
+
+    def row_col(self, index):
+        """
+        Return (row, col) for a flat index
+        """
+        return divmod(index, self._grid_width)
+
+    def clear(self):
+        """
+        Clears grid to be empty
+        """
+        self._cells[:] = bytearray(len(self._cells))
+
+    def set_empty(self, row, col):
+        """
+        Set cell with index (row, col) to be empty
+        """
+        self._cells[row * self._grid_width + col] = EMPTY
+
+    def set_full(self, row, col):
+        """
+        Set cell with index (row, col) to be full
+        """
+        self._cells[row * self._grid_width + col] = FULL
+
+    def is_empty(self, row, col):
+        """
+        Checks whether cell with index (row, col) is empty
+        """
+        return self._cells[row * self._grid_width + col] == EMPTY
+
+    def neighbor_offsets(self, eight_way = False):
+        """
+        Return the offset table: a tuple indexed by a cell's direction
+        bits, giving the flat offsets of that cell's on-grid neighbors
+        For use with get_neighbor_mask by code that walks flat indices
+        """
+        if eight_way:
+            return self._eight_table
+        return self._four_table
+
+    def get_neighbor_mask(self):
+        """
+        Return the bytearray of per-cell direction bits
+        """
+        return self._neighbor_mask
@@ -0,0 +1,41 @@
+"""
+Distinct strings over the letters of a word
+Enumerates arrangements of sub-multisets of the letters from letter
+counts, so a repeated letter never produces a repeated string, and can
+skip every string that is not a prefix of some dictionary word
+"""
+
+
+def prefix_set(words):
+    """
+    Return the set of all prefixes of the given words, the empty string
+    and the words themselves included
+    """
+    prefixes = set([""])
+    for word in words:
+        for end in range(1, len(word) + 1):
+            prefixes.add(word[:end])
+    return prefixes
+
+
+def iter_strings(letters, prefixes = None):
+    """
+    Iterate over every distinct string that can be composed from the
+    letters, each used at most as often as it occurs, in sorted order
+    and starting with the empty string
+    With a prefix set (see prefix_set), strings outside it are neither
+    yielded nor extended
+    """
+    alphabet = sorted(set(letters))
+    counts = tuple(letters.count(letter) for letter in alphabet)
+    # depth first with an explicit stack; children are pushed in reverse
+    # alphabetical order so that strings come out in sorted order
+    stack = [("", counts)]
+    while stack:
+        string, counts = stack.pop()
+        yield string
+        for idx in range(len(alphabet) - 1, -1, -1):
+            if counts[idx]:
+                child = string + alphabet[idx]
+                if prefixes is None or child in prefixes:
+                    stack.append((child, counts[:idx] + (counts[idx] - 1,) + counts[idx + 1:]))
@@ -2,23 +2,29 @@
 Queue class
 """
 
+from collections import deque
+
 class Queue:
     """
     A simple implementation of a FIFO queue.
+    Backed by a deque so that enqueue and dequeue are both O(1).
     """
 
-    def __init__(self):
-        """ 
-        Initialize the queue.
+    def __init__(self, items = None):
+        """
+        Initialize the queue, optionally with an iterable of items.
         """
-        self._items = []
+        if items is None:
+            self._items = deque()
+        else:
+            self._items = deque(items)
 
     def __len__(self):
         """
         Return the number of items in the queue.
         """
         return len(self._items)
-    
+
     def __iter__(self):
         """
         Create an iterator for the queue.
@@ -30,23 +36,42 @@ class Queue:
         """
         Return a string representation of the queue.
         """
-        return str(self._items)
+        return str(list(self._items))
 
     def enqueue(self, item):
         """
         Add item to the queue.
-        """        
+        """
         self._items.append(item)
 
+    def enqueue_many(self, items):
+        """
+        Add every item of an iterable to the queue, in order.
+        """
+        self._items.extend(items)
+
     def dequeue(self):
         """
         Remove and return the least recently inserted item.
         """
-        return self._items.pop(0)
+        return self._items.popleft()
+
+    def dequeue_many(self, count = None):
+        """
+        Remove and return a list of the count least recently inserted
+        items (all items if count is None or larger than the queue).
+        """
+        items = self._items
+        if count is None or count >= len(items):
+            result = list(items)
+            items.clear()
+            return result
+        popleft = items.popleft
+        return [popleft() for dummy_idx in range(count)]
 
     def clear(self):
         """
         Remove all items from the queue.
         """
-        self._items = []
-        
+        self._items.clear()
+
@@ -0,0 +1,91 @@
+"""
+Linear-time operations on sorted sequences, and a merge sort built on them
+remove_duplicates, intersect and merge take any iterables sorted in
+ascending order, read them once from front to back and return a lazy
+iterator, so inputs and outputs can be streamed from and to files
+"""
+
+# marks an exhausted iterator
+_DONE = object()
+
+
+def remove_duplicates(items):
+    """
+    Iterate over a sorted iterable without repeated elements
+    """
+    previous = _DONE
+    for item in items:
+        if previous is _DONE or item != previous:
+            yield item
+            previous = item
+
+
+def intersect(items1, items2):
+    """
+    Iterate over the elements of sorted items1 that also occur in sorted
+    items2; like [val for val in items1 if val in items2], an element
+    repeated in items1 is repeated in the result
+    """
+    iter2 = iter(items2)
+    other = next(iter2, _DONE)
+    for item in items1:
+        while other is not _DONE and other < item:
+            other = next(iter2, _DONE)
+        if other is _DONE:
+            return
+        if item == other:
+            yield item
+
+
+def merge(items1, items2):
+    """
+    Iterate over all elements of two sorted iterables in sorted order
+    Equal elements from items1 come before those from items2
+    """
+    iter1 = iter(items1)
+    iter2 = iter(items2)
+    first = next(iter1, _DONE)
+    second = next(iter2, _DONE)
+    while first is not _DONE and second is not _DONE:
+        if second < first:
+            yield second
+            second = next(iter2, _DONE)
+        else:
+            yield first
+            first = next(iter1, _DONE)
+    if first is not _DONE:
+        yield first
+        for item in iter1:
+            yield item
+    if second is not _DONE:
+        yield second
+        for item in iter2:
+            yield item
+
+
+def merge_sort(items):
+    """
+    Return a sorted list of the elements of an iterable
+    Bottom-up natural merge sort: the input is split into its ascending
+    runs, which are merged in pairs until one is left, so sorting takes
+    O(n log n) time at worst, O(n) for sorted input, and no recursion
+    The sort is stable
+    """
+    runs = []
+    run = []
+    for item in items:
+        if run and item < run[-1]:
+            runs.append(run)
+            run = []
+        run.append(item)
+    if run:
+        runs.append(run)
+    if not runs:
+        return []
+    while len(runs) > 1:
+        merged = [list(merge(runs[idx], runs[idx + 1]))
+                  for idx in range(0, len(runs) - 1, 2)]
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return runs[0]
@@ -0,0 +1,137 @@
+"""
+Generation-level wild fire engine
+Advances a whole fire front by one BFS layer per generation over the
+flat cells of a poc_grid.FlatGrid, where FULL marks a burned cell
+"""
+
+import math
+import random
+from array import array
+
+import poc_grid
+
+EMPTY = 0
+FULL = 1
+
+# arrival time of cells the fire never reaches
+UNBURNED = -1
+
+
+class FireFront:
+    """
+    Spreads fire from a frontier of flat cell indices to every unburned
+    four-way (or eight-way) neighbor, one generation at a time
+    """
+
+    def __init__(self, grid, eight_way = False):
+        """
+        Bind the engine to a FlatGrid whose cells record burned cells
+        """
+        self._grid = grid
+        self._eight_way = eight_way
+
+    def advance(self, frontier, generations = 1, arrival = None, start = 0):
+        """
+        Burn generations BFS layers outwards from frontier, a list of
+        burning flat indices, and return the new frontier
+        If arrival is given, arrival[idx] is set to start + k for every
+        cell idx burned in the k-th generation
+        """
+        cells = self._grid.get_cells()
+        mask = self._grid.get_neighbor_mask()
+        table = self._grid.neighbor_offsets(self._eight_way)
+        for generation in range(start + 1, start + generations + 1):
+            if not frontier:
+                break
+            next_frontier = []
+            append = next_frontier.append
+            for idx in frontier:
+                for delta in table[mask[idx]]:
+                    neighbor = idx + delta
+                    if cells[neighbor] == EMPTY:
+                        cells[neighbor] = FULL
+                        append(neighbor)
+            if arrival is not None:
+                for idx in next_frontier:
+                    arrival[idx] = generation
+            frontier = next_frontier
+        return frontier
+
+    def burn_to_completion(self, frontier):
+        """
+        Burn until the frontier dies out
+        Returns the flat arrival-time map: 0 for cells already burned,
+        k for cells burned in generation k and UNBURNED elsewhere
+        """
+        cells = self._grid.get_cells()
+        arrival = array("l", [UNBURNED if cell == EMPTY else 0 for cell in cells])
+        generation = 0
+        while frontier:
+            frontier = self.advance(frontier, 1, arrival, generation)
+            generation += 1
+        return arrival
+
+
+class StochasticFireFront(FireFront):
+    """
+    Probabilistic fire spread: each generation, every burning cell tries
+    once to ignite each unburned neighbor, succeeding with the neighbor's
+    ignition probability scaled by a wind factor for that direction
+
+    ignition is a flat array of per-cell probabilities (fuel) or a single
+    probability for every cell; wind is a (row, col) vector and the
+    factor for a direction d is max(0, 1 + wind . d / |d|)
+    """
+
+    def __init__(self, grid, ignition = 1.0, wind = (0.0, 0.0),
+                 eight_way = False, seed = None):
+        """
+        Bind the engine to a FlatGrid and set up the spread model
+        """
+        FireFront.__init__(self, grid, eight_way)
+        size = grid.get_grid_height() * grid.get_grid_width()
+        if isinstance(ignition, (int, float)):
+            self._ignition = array("d", [float(ignition)]) * size
+        else:
+            self._ignition = array("d", ignition)
+        self._rng = random.Random(seed)
+
+        # per direction-bits tables of (flat offset, wind factor), the bit
+        # for direction k being 1 << k as in poc_grid.FlatGrid
+        width = grid.get_grid_width()
+        num_directions = 8 if eight_way else 4
+        factors = []
+        for d_row, d_col in poc_grid.EIGHT_DIRECTIONS[:num_directions]:
+            length = math.sqrt(d_row * d_row + d_col * d_col)
+            factor = 1.0 + (wind[0] * d_row + wind[1] * d_col) / length
+            factors.append((d_row * width + d_col, max(0.0, factor)))
+        self._table = tuple(tuple(factors[bit] for bit in range(num_directions)
+                                  if bits & (1 << bit))
+                            for bits in range(256))
+
+    def advance(self, frontier, generations = 1, arrival = None, start = 0):
+        """
+        Burn generations stochastic generations outwards from frontier
+        and return the new frontier; see FireFront.advance
+        """
+        cells = self._grid.get_cells()
+        mask = self._grid.get_neighbor_mask()
+        table = self._table
+        ignition = self._ignition
+        rand = self._rng.random
+        for generation in range(start + 1, start + generations + 1):
+            if not frontier:
+                break
+            next_frontier = []
+            append = next_frontier.append
+            for idx in frontier:
+                for delta, factor in table[mask[idx]]:
+                    neighbor = idx + delta
+                    if cells[neighbor] == EMPTY and rand() < ignition[neighbor] * factor:
+                        cells[neighbor] = FULL
+                        append(neighbor)
+            if arrival is not None:
+                for idx in next_frontier:
+                    arrival[idx] = generation
+            frontier = next_frontier
+        return frontier
@@ -30,6 +30,7 @@ class WildFireGUI:
         self._frame.add_button("Clear all", self.clear, 100)
         self._frame.add_button("Step", self.step, 100)
         self._frame.add_button("Ten steps", self.ten_steps, 100)
+        self._frame.add_button("Generation", self.generation, 100)
         self._frame.set_mouseclick_handler(self.add_cell_index)
         self._frame.set_draw_handler(self.draw)
        
@@ -65,6 +66,13 @@ class WildFireGUI:
             if self._fire.boundary_size() > 0:
                 self._fire.update_boundary()
             
+    def generation(self):
+        """ 
+        Event handler for button that spreads the whole fire boundary by one layer
+        """
+        if self._fire.boundary_size() > 0:
+            self._fire.update_generation()
+
     def add_cell_index(self, click_position):
         """ 
         Event handler to add new cell index to the fire boundary
@@ -5,6 +5,7 @@ Click in the canvas to add cells to the boundary of the fire
 
 import poc_grid
 import poc_queue
+import poc_wildfire_engine
 import poc_wildfire_gui
 
 # constants
@@ -12,25 +13,38 @@ EMPTY = 0
 FULL = 1
 
 
-class WildFire(poc_grid.Grid):
+class WildFire(poc_grid.FlatGrid):
     """
     Class that models a burning wild fire using a grid and a queue
     The grid stores whether a cell is burned (FULL) or unburned (EMPTY)
-    The queue stores the cells on the boundary of the fire
+    The queue stores the flat indices of the cells on the boundary of the fire
     """
 
-    def __init__(self, grid_height, grid_width, queue = poc_queue.Queue()):
+    def __init__(self, grid_height, grid_width, queue = None,
+                 eight_way = False):
         """
         Override initializer for Grid, add queue to store boundary of fire
+        Each fire gets its own queue unless one is passed in
+        With eight_way set the fire also spreads to diagonal neighbors
         """
-        poc_grid.Grid.__init__(self, grid_height, grid_width)
+        poc_grid.FlatGrid.__init__(self, grid_height, grid_width)
+        if queue is None:
+            queue = poc_queue.Queue()
         self._fire_boundary = queue
+        self._front = poc_wildfire_engine.FireFront(self, eight_way)
+
+    def set_spread_model(self, front):
+        """
+        Replace the spread engine, e.g. with a
+        poc_wildfire_engine.StochasticFireFront built on this fire
+        """
+        self._front = front
 
     def clear(self):
         """
         Set cells to be unburned and the fire boundary to be empty
         """
-        poc_grid.Grid.clear(self)
+        poc_grid.FlatGrid.clear(self)
         self._fire_boundary.clear()  
 
 
@@ -38,13 +52,13 @@ class WildFire(poc_grid.Grid):
         """
         Add cell with index (row, col) the boundary of the fire
         """
-        self._fire_boundary.enqueue((row, col))
+        self._fire_boundary.enqueue(self.index(row, col))
     
     def dequeue_boundary(self):
         """
         Remove an element from the boundary of the fire
         """
-        return self._fire_boundary.dequeue()
+        return self.row_col(self._fire_boundary.dequeue())
     
     def boundary_size(self):
         """
@@ -56,8 +70,8 @@ class WildFire(poc_grid.Grid):
         """
         Generator for the boundary of the fire
         """
-        for cell in self._fire_boundary:
-            yield cell
+        for idx in self._fire_boundary:
+            yield self.row_col(idx)
         # alternative syntax
         #return (cell for cell in self._fire_boundary)
     
@@ -67,13 +81,44 @@ class WildFire(poc_grid.Grid):
         Updates both the cells and the fire_boundary
         """
         cell = self._fire_boundary.dequeue()
-        neighbors = self.four_neighbors(cell[0], cell[1])
-        #neighbors = self.eight_neighbors(cell[0], cell[1])
-        for neighbor in neighbors:
-            if self.is_empty(neighbor[0], neighbor[1]):
-                self.set_full(neighbor[0], neighbor[1])
-                self._fire_boundary.enqueue(neighbor)
-
-                
-# run gui to visualize wildfire                
-poc_wildfire_gui.run_gui(WildFire(30, 40))
+        self._fire_boundary.enqueue_many(self._front.advance([cell]))
+
+    def update_generation(self, generations = 1):
+        """
+        Spread the whole fire boundary by the given number of BFS layers
+        Updates both the cells and the fire_boundary
+        """
+        frontier = self._fire_boundary.dequeue_many()
+        self._fire_boundary.enqueue_many(self._front.advance(frontier, generations))
+
+    def burn_to_completion(self):
+        """
+        Spread the fire until the boundary is empty
+        Returns the arrival-time map as a flat array indexed by
+        row * width + col: 0 for cells burned before the call, k for
+        cells burned in generation k, poc_wildfire_engine.UNBURNED for
+        cells the fire never reaches
+        """
+        frontier = self._fire_boundary.dequeue_many()
+        return self._front.burn_to_completion(frontier)
+
+
+
+def step_all(fires, generations = 1):
+    """
+    Advance every fire in fires by the given number of BFS layers
+    Fires whose boundary is empty are skipped
+    Returns the number of fires still burning
+    """
+    burning = 0
+    for fire in fires:
+        if fire.boundary_size() > 0:
+            fire.update_generation(generations)
+            if fire.boundary_size() > 0:
+                burning += 1
+    return burning
+
+
+# run gui to visualize wildfire
+if __name__ == "__main__":
+    poc_wildfire_gui.run_gui(WildFire(30, 40))
@@ -0,0 +1,123 @@
+"""
+Anagram index over a word list
+Maps the signature of a word (its letters in sorted order) to the
+words with that signature, so that all words that can be spelled from
+a set of letters are found by looking up the signatures of its
+sub-multisets instead of generating and checking strings
+
+Usage: python poc_word_index.py words.txt words.index --query letters
+"""
+
+import argparse
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+
+def signature(word):
+    """
+    Return the letters of a word in sorted order
+    """
+    return "".join(sorted(word))
+
+
+class AnagramIndex:
+    """
+    Signature to word index for one dictionary
+    """
+
+    def __init__(self, words = ()):
+        """
+        Index an iterable of words; empty strings are skipped
+        """
+        self._words = {}
+        self._max_length = 0
+        for word in words:
+            if word:
+                self._words.setdefault(signature(word), []).append(word)
+                self._max_length = max(self._max_length, len(word))
+        for group in self._words.values():
+            group.sort()
+
+    def __len__(self):
+        """
+        Return the number of distinct signatures
+        """
+        return len(self._words)
+
+    def anagrams(self, letters):
+        """
+        Return the sorted dictionary words that use exactly the letters
+        """
+        return list(self._words.get(signature(letters), ()))
+
+    def signatures(self, letters):
+        """
+        Iterate over the signatures of all non-empty sub-multisets of
+        the letters that are no longer than the longest word
+        """
+        alphabet = sorted(set(letters))
+        counts = [letters.count(letter) for letter in alphabet]
+        # choose how many of each letter to use, one letter at a time
+        stack = [(0, "")]
+        while stack:
+            idx, prefix = stack.pop()
+            if idx == len(alphabet):
+                if prefix:
+                    yield prefix
+                continue
+            for used in range(min(counts[idx], self._max_length - len(prefix)) + 1):
+                stack.append((idx + 1, prefix + alphabet[idx] * used))
+
+    def words_from(self, letters):
+        """
+        Return the sorted list of dictionary words that can be spelled
+        with the letters, each used at most as often as it occurs
+        """
+        found = []
+        for key in self.signatures(letters):
+            found.extend(self._words.get(key, ()))
+        found.sort()
+        return found
+
+    def save(self, filename):
+        """
+        Write the index to a binary file
+        """
+        with open(filename, "wb") as index_file:
+            pickle.dump((self._words, self._max_length), index_file,
+                        pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read an index written by save
+        """
+        index = cls()
+        with open(filename, "rb") as index_file:
+            index._words, index._max_length = pickle.load(index_file)
+        return index
+
+
+def main(argv = None):
+    """
+    Command line entry point: build and save the index of a word file
+    """
+    parser = argparse.ArgumentParser(description = "Build an anagram index")
+    parser.add_argument("words", help = "word file, one word per line")
+    parser.add_argument("index", help = "index file to write")
+    parser.add_argument("--query", default = None,
+                        help = "print the words that can be spelled with these letters")
+    args = parser.parse_args(argv)
+
+    with open(args.words) as word_file:
+        index = AnagramIndex(line.strip() for line in word_file)
+    index.save(args.index)
+    if args.query is not None:
+        print(" ".join(index.words_from(args.query)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Array-backed trie over a word list
+Nodes are numbered in breadth first order, so the children of a node are
+consecutive and the whole trie fits in three flat arrays, with no Python
+object per node:
+    first_child[node]  first child of node; its children end where
+                       first_child[node + 1] begins
+    label[node]        byte on the edge into node, children sorted by it
+    terminal[node]     1 if the path to node spells a word
+Words are stored as UTF-8 bytes; node 0 is the root
+Files hold first_child as 4-byte little-endian integers whatever the
+platform, so they load the same everywhere
+
+Usage: python poc_word_trie.py words.txt words.trie --query letters
+"""
+
+import argparse
+import array
+import collections
+import struct
+import sys
+
+# file header: magic, number of nodes, number of words
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"TRI1"
+
+# array type of 4-byte node indices
+_INDEX_TYPE = "i" if array.array("i").itemsize == 4 else "l"
+_INDEX_SIZE = 4
+
+# one-byte strings for bytearray.find, by byte value
+_BYTES = [bytes(bytearray((value,))) for value in range(256)]
+
+
+def _encode(word):
+    """
+    Return the UTF-8 bytes of a word
+    """
+    if not isinstance(word, bytes):
+        word = word.encode("utf-8")
+    return word
+
+
+def _decode(word):
+    """
+    Return the text of the UTF-8 bytes of a word
+    """
+    return bytes(word).decode("utf-8")
+
+
+def _to_bytes(values):
+    """
+    Return the little-endian representation of an index array
+    """
+    if sys.byteorder == "big":
+        values = array.array(_INDEX_TYPE, values)
+        values.byteswap()
+    if hasattr(values, "tobytes"):
+        return values.tobytes()
+    return values.tostring()
+
+
+def _from_bytes(data):
+    """
+    Return the index array of little-endian representation data
+    """
+    values = array.array(_INDEX_TYPE)
+    if hasattr(values, "frombytes"):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class WordTrie:
+    """
+    Compact trie supporting membership, prefix and sub-word queries
+    """
+
+    def __init__(self, words = ()):
+        """
+        Build the trie of an iterable of words; empty strings and
+        duplicates are skipped
+        """
+        words = [bytearray(word)
+                 for word in sorted(set(_encode(word) for word in words if word))]
+        self._size = len(words)
+        self._first_child = array.array(_INDEX_TYPE, [1])
+        self._label = bytearray(1)
+        self._terminal = bytearray(1)
+        # each pending node is the range of sorted words sharing its
+        # prefix; nodes are numbered in the order they are queued
+        pending = collections.deque([(0, len(words), 0)])
+        while pending:
+            low, high, depth = pending.popleft()
+            if low < high and len(words[low]) == depth:
+                self._terminal[len(self._first_child) - 1] = 1
+                low += 1
+            while low < high:
+                byte = words[low][depth]
+                end = low + 1
+                while end < high and words[end][depth] == byte:
+                    end += 1
+                pending.append((low, end, depth + 1))
+                self._label.append(byte)
+                self._terminal.append(0)
+                low = end
+            self._first_child.append(len(self._label))
+
+    def __len__(self):
+        """
+        Return the number of words
+        """
+        return self._size
+
+    def node_count(self):
+        """
+        Return the number of nodes, root included
+        """
+        return len(self._label)
+
+    def _child(self, node, byte):
+        """
+        Return the child of node along byte, or -1
+        """
+        return self._label.find(_BYTES[byte], self._first_child[node],
+                                self._first_child[node + 1])
+
+    def _walk(self, word):
+        """
+        Return the node reached by spelling word from the root, or -1
+        """
+        node = 0
+        for byte in bytearray(_encode(word)):
+            node = self._child(node, byte)
+            if node < 0:
+                break
+        return node
+
+    def __contains__(self, word):
+        """
+        Return True if word is in the trie
+        """
+        node = self._walk(word)
+        return node >= 0 and self._terminal[node] == 1
+
+    def has_prefix(self, prefix):
+        """
+        Return True if some word starts with prefix
+        """
+        return self._walk(prefix) >= 0
+
+    def words_with_prefix(self, prefix = ""):
+        """
+        Iterate over the words that start with prefix, in sorted order
+        """
+        node = self._walk(prefix)
+        if node < 0:
+            return
+        stack = [(node, bytearray(_encode(prefix)))]
+        while stack:
+            node, word = stack.pop()
+            if self._terminal[node]:
+                yield _decode(word)
+            for child in range(self._first_child[node + 1] - 1,
+                               self._first_child[node] - 1, -1):
+                stack.append((child, word + _BYTES[self._label[child]]))
+
+    def sub_words(self, letters):
+        """
+        Iterate over the words that can be spelled with the letters,
+        each used at most as often as it occurs, in sorted order
+        """
+        counts = collections.Counter(bytearray(_encode(letters)))
+        # depth first, following only edges whose byte is still unused
+        stack = [(0, bytearray())]
+        while stack:
+            node, word = stack.pop()
+            if self._terminal[node]:
+                yield _decode(word)
+            for child in range(self._first_child[node + 1] - 1,
+                               self._first_child[node] - 1, -1):
+                byte = self._label[child]
+                if counts[byte] > word.count(_BYTES[byte]):
+                    stack.append((child, word + _BYTES[byte]))
+
+    def save(self, filename):
+        """
+        Write the trie to a binary file
+        """
+        with open(filename, "wb") as trie_file:
+            trie_file.write(_HEADER.pack(_MAGIC, len(self._label), self._size))
+            trie_file.write(_to_bytes(self._first_child))
+            trie_file.write(bytes(self._label))
+            trie_file.write(bytes(self._terminal))
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read a trie written by save
+        """
+        trie = cls()
+        with open(filename, "rb") as trie_file:
+            magic, nodes, size = _HEADER.unpack(trie_file.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError("not a word trie file: " + filename)
+            first_child = trie_file.read((nodes + 1) * _INDEX_SIZE)
+            label = bytearray(trie_file.read(nodes))
+            terminal = bytearray(trie_file.read(nodes))
+        if (len(first_child) != (nodes + 1) * _INDEX_SIZE or
+                len(label) != nodes or len(terminal) != nodes):
+            raise ValueError("truncated word trie file: " + filename)
+        first_child = _from_bytes(first_child)
+        if len(first_child) != nodes + 1:
+            raise ValueError("unsupported index size reading " + filename)
+        trie._first_child = first_child
+        trie._label = label
+        trie._terminal = terminal
+        trie._size = size
+        return trie
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        Build the trie of a word file, one word per line
+        """
+        with open(filename) as word_file:
+            return cls(line.strip() for line in word_file)
+
+
+def main(argv = None):
+    """
+    Command line entry point: build and save the trie of a word file
+    """
+    parser = argparse.ArgumentParser(description = "Build a compact word trie")
+    parser.add_argument("words", help = "word file, one word per line")
+    parser.add_argument("trie", help = "trie file to write")
+    parser.add_argument("--query", default = None,
+                        help = "print the words that can be spelled with these letters")
+    args = parser.parse_args(argv)
+
+    trie = WordTrie.from_file(args.words)
+    trie.save(args.trie)
+    print("%d words, %d nodes" % (len(trie), trie.node_count()))
+    if args.query is not None:
+        print(" ".join(trie.sub_words(args.query)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Headless runner for the Zombie Apocalypse simulation
+Loads a scenario, runs a number of flee/stalk ticks without the GUI and
+reports throughput, per-phase timing and the final agent positions
+
+Scenario files are JSON objects:
+    {"grid_height": 30, "grid_width": 40,
+     "obstacles": [[row, col], ...],
+     "humans": [[row, col], ...],
+     "zombies": [[row, col], ...],
+     "seed": 0, "incremental": false}
+
+Usage: python poc_zombie_runner.py scenario.json --ticks 1000
+"""
+
+import argparse
+import json
+import timeit
+
+import week6_zombies
+
+# phases of one tick, in the order the GUI buttons would run them
+PHASES = ("zombie_field", "move_humans", "human_field", "move_zombies")
+
+
+def load_scenario(filename):
+    """
+    Load a scenario dictionary from a JSON file
+    """
+    with open(filename) as scenario_file:
+        return json.load(scenario_file)
+
+
+def build_simulation(scenario):
+    """
+    Create an Apocalypse from a scenario dictionary
+    Missing agent and obstacle lists default to empty
+    """
+    return week6_zombies.Apocalypse(
+        scenario["grid_height"], scenario["grid_width"],
+        [tuple(cell) for cell in scenario.get("obstacles", [])],
+        [tuple(cell) for cell in scenario.get("zombies", [])],
+        [tuple(cell) for cell in scenario.get("humans", [])],
+        incremental = scenario.get("incremental", False),
+        seed = scenario.get("seed"))
+
+
+def run_tick(simulation, phase_seconds, timer = timeit.default_timer):
+    """
+    Run one flee step followed by one stalk step, adding the time spent
+    in each phase to the phase_seconds dictionary
+    """
+    start = timer()
+    zombie_distance = simulation.compute_distance_field(week6_zombies.ZOMBIE)
+    after_field = timer()
+    simulation.move_humans(zombie_distance)
+    after_humans = timer()
+    human_distance = simulation.compute_distance_field(week6_zombies.HUMAN)
+    after_field2 = timer()
+    simulation.move_zombies(human_distance)
+    end = timer()
+    phase_seconds["zombie_field"] += after_field - start
+    phase_seconds["move_humans"] += after_humans - after_field
+    phase_seconds["human_field"] += after_field2 - after_humans
+    phase_seconds["move_zombies"] += end - after_field2
+
+
+def run_simulation(simulation, ticks):
+    """
+    Run ticks flee/stalk ticks and return a report dictionary with the
+    elapsed time, ticks per second, per-phase seconds and the final
+    human and zombie positions
+    """
+    phase_seconds = dict((phase, 0.0) for phase in PHASES)
+    timer = timeit.default_timer
+    start = timer()
+    for dummy_tick in range(ticks):
+        run_tick(simulation, phase_seconds, timer)
+    seconds = timer() - start
+    return {"ticks": ticks,
+            "seconds": seconds,
+            "ticks_per_second": ticks / seconds if seconds > 0 else float("inf"),
+            "phase_seconds": phase_seconds,
+            "humans": [list(cell) for cell in simulation.humans()],
+            "zombies": [list(cell) for cell in simulation.zombies()]}
+
+
+def format_report(report):
+    """
+    Return a human readable summary of a run report
+    """
+    lines = ["%d ticks in %.3f s (%.1f ticks/s)"
+             % (report["ticks"], report["seconds"], report["ticks_per_second"])]
+    for phase in PHASES:
+        lines.append("  %-14s %.3f s" % (phase, report["phase_seconds"][phase]))
+    lines.append("humans: " + str(report["humans"]))
+    lines.append("zombies: " + str(report["zombies"]))
+    return "\n".join(lines)
+
+
+def main(argv = None):
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description = "Run a zombie scenario without the GUI")
+    parser.add_argument("scenario", help = "JSON scenario file")
+    parser.add_argument("--ticks", type = int, default = 100,
+                        help = "number of flee/stalk ticks to run")
+    parser.add_argument("--seed", type = int, default = None,
+                        help = "override the scenario seed")
+    parser.add_argument("--json", action = "store_true",
+                        help = "print the report as JSON")
+    args = parser.parse_args(argv)
+
+    scenario = load_scenario(args.scenario)
+    if args.seed is not None:
+        scenario["seed"] = args.seed
+    report = run_simulation(build_simulation(scenario), args.ticks)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Monte Carlo sweep over Zombie Apocalypse scenarios
+Runs many independently seeded simulations of a scenario across a
+process pool, streams per-run statistics as they finish and aggregates
+them in run order, so results depend only on the master seed
+
+A human is caught when it ends a tick on the same cell as a zombie
+mean_distance averages the zombie distance of humans over all ticks,
+leaving out (and counting as unreachable_samples) humans no zombie can
+reach
+
+Usage: python poc_zombie_sweep.py scenario.json --runs 1000 --seed 42
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+
+import poc_zombie_runner
+import week6_zombies
+
+
+def run_seeds(master_seed, runs):
+    """
+    Derive one seed per run from the master seed
+    """
+    rng = random.Random(master_seed)
+    return [rng.getrandbits(32) for dummy_idx in range(runs)]
+
+
+def run_one(task):
+    """
+    Worker: run one seeded simulation until every human is caught or
+    max_ticks ticks have passed
+    task is a tuple (run_index, scenario, seed, max_ticks)
+    Returns a dictionary of per-run statistics
+    """
+    run_index, scenario, seed, max_ticks = task
+    scenario = dict(scenario)
+    scenario["seed"] = seed
+    simulation = poc_zombie_runner.build_simulation(scenario)
+    initial_humans = simulation.num_humans()
+    # distance fields hold this value on cells no zombie can reach
+    unreachable = simulation.get_grid_height() * simulation.get_grid_width()
+
+    distance_total = 0
+    distance_samples = 0
+    unreachable_samples = 0
+    caught_tick = None
+    ticks = 0
+    while ticks < max_ticks and simulation.num_humans() > 0:
+        zombie_distance = simulation.compute_distance_field(week6_zombies.ZOMBIE)
+        for row, col in simulation.humans():
+            if zombie_distance[row][col] == unreachable:
+                unreachable_samples += 1
+            else:
+                distance_total += zombie_distance[row][col]
+                distance_samples += 1
+        simulation.move_humans(zombie_distance)
+        simulation.move_zombies(simulation.compute_distance_field(week6_zombies.HUMAN))
+        simulation.remove_caught_humans()
+        ticks += 1
+    if simulation.num_humans() == 0:
+        caught_tick = ticks
+
+    return {"run": run_index,
+            "seed": seed,
+            "ticks": ticks,
+            "all_caught_tick": caught_tick,
+            "humans_caught": initial_humans - simulation.num_humans(),
+            "mean_distance": (float(distance_total) / distance_samples
+                              if distance_samples else None),
+            "unreachable_samples": unreachable_samples}
+
+
+def sweep(scenario, runs, master_seed, max_ticks, processes = None):
+    """
+    Generator that runs the sweep on a process pool and yields per-run
+    statistics dictionaries in completion order
+    """
+    tasks = [(run_index, scenario, seed, max_ticks)
+             for run_index, seed in enumerate(run_seeds(master_seed, runs))]
+    pool = multiprocessing.Pool(processes)
+    try:
+        for stats in pool.imap_unordered(run_one, tasks):
+            yield stats
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def aggregate(results):
+    """
+    Combine per-run statistics into summary statistics
+    Runs are taken in run order, so the result does not depend on the
+    order in which workers finished
+    """
+    results = sorted(results, key = lambda stats: stats["run"])
+    caught = [stats["all_caught_tick"] for stats in results
+              if stats["all_caught_tick"] is not None]
+    distances = [stats["mean_distance"] for stats in results
+                 if stats["mean_distance"] is not None]
+    summary = {"runs": len(results),
+               "runs_all_caught": len(caught),
+               "mean_all_caught_tick": None,
+               "mean_distance": None,
+               "unreachable_samples": sum(stats["unreachable_samples"]
+                                          for stats in results)}
+    if caught:
+        summary["mean_all_caught_tick"] = float(sum(caught)) / len(caught)
+    if distances:
+        summary["mean_distance"] = sum(distances) / len(distances)
+    return summary
+
+
+def main(argv = None):
+    """
+    Command line entry point: one JSON line per run, then the summary
+    """
+    parser = argparse.ArgumentParser(description = "Monte Carlo sweep of a zombie scenario")
+    parser.add_argument("scenario", help = "JSON scenario file")
+    parser.add_argument("--runs", type = int, default = 100)
+    parser.add_argument("--seed", type = int, default = 0, help = "master seed")
+    parser.add_argument("--max-ticks", type = int, default = 1000)
+    parser.add_argument("--processes", type = int, default = None,
+                        help = "worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    scenario = poc_zombie_runner.load_scenario(args.scenario)
+    results = []
+    for stats in sweep(scenario, args.runs, args.seed, args.max_ticks, args.processes):
+        print(json.dumps(stats))
+        results.append(stats)
+    print(json.dumps({"summary": aggregate(results)}))
+
+
+if __name__ == "__main__":
+    main()
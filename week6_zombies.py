@@ -3,9 +3,10 @@ Student portion of Zombie Apocalypse mini-project
 """
 
 import random
+from array import array
+import poc_agent_moves
 import poc_grid
-import poc_queue
-import poc_zombie_gui
+import poc_distance_field
 
 # global constants
 EMPTY = 0 
@@ -16,19 +17,34 @@ OBSTACLE = 5
 HUMAN = 6
 ZOMBIE = 7
 
-class Apocalypse(poc_grid.Grid):
+class Apocalypse(poc_grid.FlatGrid):
     """
     Class for simulating zombie pursuit of human on grid with
     obstacles
     """
 
     def __init__(self, grid_height, grid_width, obstacle_list = None, 
-                 zombie_list = None, human_list = None):
+                 zombie_list = None, human_list = None, incremental = False,
+                 seed = None):
         """
         Create a simulation of given size with given obstacles,
         humans, and zombies
-        """
-        poc_grid.Grid.__init__(self, grid_height, grid_width)
+        With incremental set, distance fields are repaired from the
+        previous tick instead of being recomputed from scratch
+        seed seeds the generator that breaks ties between equally good moves
+        """
+        poc_grid.FlatGrid.__init__(self, grid_height, grid_width)
+        self._incremental = incremental
+        if incremental:
+            engine = poc_distance_field.IncrementalDistanceField
+        else:
+            engine = poc_distance_field.DistanceField
+        self._distance_fields = {HUMAN: engine(self), ZOMBIE: engine(self)}
+        # obstacle cells changed since each field was last brought up to date
+        self._changed_cells = {HUMAN: [], ZOMBIE: []}
+        # row lists last returned by compute_distance_field
+        self._field_rows = {}
+        self._rng = random.Random(seed)
 
         if obstacle_list != None:
             self._obstacle_list = list(obstacle_list)
@@ -53,9 +69,35 @@ class Apocalypse(poc_grid.Grid):
         Set cells in obstacle grid to be empty
         Reset zombie and human lists to be empty
         """
-        poc_grid.Grid.clear(self)
+        poc_grid.FlatGrid.clear(self)
         self._human_list=[]       
         self._zombie_list=[]
+        if self._incremental:
+            for entity_type in self._distance_fields:
+                self._distance_fields[entity_type].reset()
+                self._changed_cells[entity_type] = []
+
+    def set_empty(self, row, col):
+        """
+        Set cell with index (row, col) to be empty
+        """
+        poc_grid.FlatGrid.set_empty(self, row, col)
+        self._record_change(row, col)
+
+    def set_full(self, row, col):
+        """
+        Set cell with index (row, col) to be full
+        """
+        poc_grid.FlatGrid.set_full(self, row, col)
+        self._record_change(row, col)
+
+    def _record_change(self, row, col):
+        """
+        Remember an obstacle change for the incremental distance fields
+        """
+        if self._incremental:
+            for changed in self._changed_cells.values():
+                changed.append(self.index(row, col))
         
     def add_zombie(self, row, col):
         """
@@ -98,109 +140,72 @@ class Apocalypse(poc_grid.Grid):
         for num in self._human_list:
                 yield num
         
+    def remove_caught_humans(self):
+        """
+        Remove every human that shares a cell with a zombie
+        Returns the number of humans removed
+        """
+        zombie_cells = set(self._zombie_list)
+        remaining = [cell for cell in self._human_list if cell not in zombie_cells]
+        caught = len(self._human_list) - len(remaining)
+        self._human_list = remaining
+        return caught
+
     def compute_distance_field(self, entity_type):
         """
         Function computes and returns a 2D distance field
         Distance at member of entity_list is zero
         Shortest paths avoid obstacles and use four-way distances
+        The obstacle grid is left untouched
         """
-        self._visited = self._cells
-        self._distance_field = [[(self._grid_width*self._grid_height)for _ in range(self._grid_width)] 
-                       for __ in range(self._grid_height)]
-        
-        self._boundary = poc_queue.Queue()
-        
         type_dic={HUMAN: self.humans(), ZOMBIE: self.zombies()}
-        
-        for item in type_dic[entity_type]:
-                self._boundary.enqueue(item)
-                self._visited[item[0]][item[1]]= FULL
-                self._distance_field[item[0]][item[1]]=0
-                
-        _score = 0
-        
-        while len(self._boundary)!=0:
-            
-            number_in_boundary = len(self._boundary)
-            neighbor_set = set()
-            
-            for _ in range(number_in_boundary):
-                cell = self._boundary.dequeue() 
-                neighbors = self.four_neighbors(cell[0], cell[1])
-                for each in neighbors:
-                        neighbor_set.add(each)
-                    
-            for neighbor in neighbor_set:
-                if self._visited[neighbor[0]][neighbor[1]]!= FULL:
-                    self._visited[neighbor[0]][neighbor[1]]= FULL
-                    self._distance_field[neighbor[0]][neighbor[1]]=_score+1
-                    self._boundary.enqueue(neighbor)
-            
-            _score += 1
-                                
-        return self._distance_field
+        engine = self._distance_fields[entity_type]
+        sources = [self.index(item[0], item[1]) for item in type_dic[entity_type]]
+        if self._incremental:
+            engine.update(sources, self._changed_cells[entity_type])
+            self._changed_cells[entity_type] = []
+        else:
+            engine.compute(sources)
+        self._field_rows[entity_type] = engine.as_rows()
+        return self._field_rows[entity_type]
+
+    def _flat_field(self, entity_type, distance_field):
+        """
+        Return a flat array for a distance field given as row lists,
+        reusing the engine buffer when it is the field last computed
+        """
+        if distance_field is self._field_rows.get(entity_type):
+            return self._distance_fields[entity_type].get_distance()
+        return array("l", [value for row in distance_field for value in row])
 
     def move_humans(self, zombie_distance_field):
         """
         Function that moves humans away from zombies, diagonal moves
         are allowed
         """
-
-        update_list = []
-        for item in self._human_list:
-            possible_move = self.eight_neighbors(item[0], item[1])
-            possible_move.append((item[0], item[1]))
-            
-            possible_move2=[] 
-            for each in possible_move:
-                if self.is_empty(each[0], each[1]):
-                    possible_move2.append(each)
-
-            move ={}
-            for each in possible_move2:
-                move[each]= zombie_distance_field[each[0]][each[1]]
-            
-            _max = max(move.values())
-            max_key=[]
-            for key, value in move.items():
-                if value==_max:
-                    max_key.append(key)
-            
-            update_list.append(random.choice(max_key))
-        
-        self._human_list = update_list
+        distance = self._flat_field(ZOMBIE, zombie_distance_field)
+        width = self._grid_width
+        moved = poc_agent_moves.move_agents(
+            self, distance, [row * width + col for row, col in self._human_list],
+            True, True, self._rng)
+        self._human_list = [divmod(cell, width) for cell in moved]
                                  
     def move_zombies(self, human_distance_field):
         """
         Function that moves zombies towards humans, no diagonal moves
         are allowed
         """
-
-        update_list = []
-        for item in self._zombie_list:
-            possible_move = self.four_neighbors(item[0], item[1])
-            possible_move.append((item[0], item[1]))
-            
-            possible_move2=[] 
-            for each in possible_move:
-                if self.is_empty(each[0], each[1]):
-                    possible_move2.append(each)
-                                              
-            move ={}
-            for each in possible_move2:
-                move[each]= human_distance_field[each[0]][each[1]]
-            
-            _min = min(move.values())
-            min_key=[]
-            for key, value in move.items():
-                if value==_min:
-                    min_key.append(key)
-            
-            update_list.append(random.choice(min_key))
-
-        self._zombie_list =  update_list
+        distance = self._flat_field(HUMAN, human_distance_field)
+        width = self._grid_width
+        moved = poc_agent_moves.move_agents(
+            self, distance, [row * width + col for row, col in self._zombie_list],
+            False, False, self._rng)
+        self._zombie_list = [divmod(cell, width) for cell in moved]
 
 # Start up gui for simulation - You will need to write some code above
 # before this will work without errors
+# Headless runs go through poc_zombie_runner instead
 
-poc_zombie_gui.run_gui(Apocalypse(30, 40))
+if __name__ == "__main__":
+    import poc_zombie_gui
+    poc_zombie_gui.run_gui(Apocalypse(30, 40))
@@ -4,11 +4,18 @@ Student code for Word Wrangler game
 
 import urllib2
 import codeskulptor
+import poc_letter_strings
+import poc_sorted_lists
+import poc_word_index
+import poc_word_trie
 import poc_wrangler_provided as provided
 codeskulptor.set_timeout(100000000)
 
 WORDFILE = "assets_scrabble_words3.txt"
 
+# anagram indexes of the word files read by load_words, by file name
+_WORD_INDEXES = {}
+
 # Functions to manipulate ordered word lists
 
 def remove_duplicates(list1):
@@ -20,12 +27,7 @@ def remove_duplicates(list1):
 
     This function can be iterative and not use set().
     """
-    list2=[]
-    for each in list1:
-        if each not in list2:
-            list2.append(each)            
-
-    return list2 
+    return list(poc_sorted_lists.remove_duplicates(list1))
 
 def intersect(list1, list2):
     """
@@ -36,7 +38,7 @@ def intersect(list1, list2):
 
     This function can be iterative.
     """    
-    return [val for val in list1 if val in list2]
+    return list(poc_sorted_lists.intersect(list1, list2))
 
 # Functions to perform merge sort
 
@@ -49,18 +51,7 @@ def merge(list1, list2):
 
     This function can be iterative.
     """ 
-    list3 =list1+list2
-    new_list=[]
-    while list3:
-        minimum = list3[0]  
-        for num in list3: 
-            if num < minimum:
-                minimum = num
-                
-        new_list.append(minimum)
-        list3.remove(minimum)    
-
-    return new_list
+    return list(poc_sorted_lists.merge(list1, list2))
 
 def merge_sort(list1):
     """
@@ -68,50 +59,22 @@ def merge_sort(list1):
 
     Return a new sorted list with the same elements as list1.
 
-    This function should be recursive.
+    Sorts bottom-up, so long lists do not hit the recursion limit.
     """
-    if list1 == []:
-        return list1
-    else:
-        pivot = list1[0]
-        lesser = [num for num in list1 if num < pivot]
-        equal = [num for num in list1 if num == pivot]
-        greater = [num for num in list1 if num > pivot]
-        return merge(merge_sort(lesser)+equal, merge_sort(greater))
+    return poc_sorted_lists.merge_sort(list1)
     
 # Function to generate all strings for the word wrangler game
 
-def gen_all_strings(word):
+def gen_all_strings(word, prefixes=None):
     """
     Generate all strings that can be composed from the letters in word
     in any order.
 
-    Returns a list of all strings that can be formed from the letters
-    in word.
-
-    This function should be recursive.
+    Returns a sorted list of all distinct strings that can be formed
+    from the letters in word; with a set of dictionary prefixes, only
+    strings that start some dictionary word.
     """ 
-    word_list=[]
-    if word == "":
-        return [""]
-    else:
-        first = word[0]
-        all_but_first = gen_all_strings(word[1:])
-        
-        word_list.append(first)
-        
-        for let in all_but_first:
-            word_list.append(let)  
-            
-            if let!="":
-                word_list.append(first+let)
-                word_list.append(let+first)
-                num = 1
-                while num < len(let): 
-                    word_list.append(let[:num]+first+let[num:])
-                    num +=1
-                         
-    return word_list 
+    return list(poc_letter_strings.iter_strings(word, prefixes))
 
 # Function to load words from a file
 
@@ -119,25 +82,54 @@ def load_words(filename):
     """
     Load word list from the file named filename.
 
-    Returns a list of strings.
+    Returns a list of strings; also indexes them for valid_words.
+    """
+    url = codeskulptor.file2url(filename)
+    net_file = urllib2.urlopen(url)
+    words = net_file.read().split('\n')
+    _WORD_INDEXES[filename] = poc_word_index.AnagramIndex(words)
+    return words
+
+def valid_words(letters, filename=WORDFILE):
+    """
+    Find the dictionary words that can be spelled from letters.
+
+    Returns a sorted list of words, looked up in the anagram index of
+    the word file (loaded on first use).
+    """
+    if filename not in _WORD_INDEXES:
+        load_words(filename)
+    return _WORD_INDEXES[filename].words_from(letters)
+
+def load_trie(filename=WORDFILE):
+    """
+    Load the word list from the file named filename into a trie.
+
+    Returns a poc_word_trie.WordTrie, which answers membership, prefix
+    and sub-word queries without scanning the list.
+
+    Streams the file into the trie rather than calling load_words, so
+    neither the word list nor an anagram index is kept around.
     """
     url = codeskulptor.file2url(filename)
-    netfile = urllib2.urlopen(url)
-                          
-    return net_file.read().split('\n')
+    net_file = urllib2.urlopen(url)
+    return poc_word_trie.WordTrie(line.rstrip('\n') for line in net_file)
 
 def run():
     """
     Run game.
     """
     words = load_words(WORDFILE)
+    # the index query already yields dictionary words only, so the
+    # game's intersect against the word list keeps all of them
     wrangler = provided.WordWrangler(words, remove_duplicates, 
                                      intersect, merge_sort, 
-                                     gen_all_strings)
+                                     valid_words)
     provided.run_game(wrangler)
 
 # Uncomment when you are ready to try the game
-run()
+if __name__ == "__main__":
+    run()
 
     
     
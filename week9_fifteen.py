@@ -4,7 +4,10 @@ Note that solved configuration has the blank (zero) tile in upper left
 Use the arrows key to swap this tile with its neighbors
 """
 
-import poc_fifteen_gui
+import poc_fifteen_bidir
+import poc_fifteen_ida
+import poc_fifteen_instances
+import poc_fifteen_moves
 
 class Puzzle:
     """
@@ -18,14 +21,17 @@ class Puzzle:
         """
         self._height = puzzle_height
         self._width = puzzle_width
-        self._grid = [[col + puzzle_width * row
-                       for col in range(self._width)]
-                      for row in range(self._height)]
+        # tiles in row-major order, and the flat position of every tile
+        self._tiles = list(range(puzzle_height * puzzle_width))
 
         if initial_grid != None:
             for row in range(puzzle_height):
                 for col in range(puzzle_width):
-                    self._grid[row][col] = initial_grid[row][col]
+                    self._tiles[col + puzzle_width * row] = initial_grid[row][col]
+
+        self._positions = list(range(puzzle_height * puzzle_width))
+        for pos, tile in enumerate(self._tiles):
+            self._positions[tile] = pos
 
     def __str__(self):
         """
@@ -33,11 +39,19 @@ class Puzzle:
         Returns a string
         """
         ans = ""
-        for row in range(self._height):
-            ans += str(self._grid[row])
+        for row in self._rows():
+            ans += str(row)
             ans += "\n"
         return ans
 
+    def _rows(self):
+        """
+        Return the puzzle as a list of row lists
+        """
+        width = self._width
+        return [self._tiles[row * width:(row + 1) * width]
+                for row in range(self._height)]
+
     #####################################
     # GUI methods
 
@@ -60,34 +74,41 @@ class Puzzle:
         Getter for the number at tile position pos
         Returns an integer
         """
-        return self._grid[row][col]
+        return self._tiles[col + self._width * row]
     
     def get_row_col(self, number):
         """
         Return row, col for a given number
         """
-        for row in range(self._height):
-            for col in range(self._width):
-                if self.get_number(row, col)== number:
-                    return (row, col)
+        return divmod(self._positions[number], self._width)
                         
     def set_number(self, row, col, value):
         """
         Setter for the number at tile position pos
         """
-        self._grid[row][col] = value
+        pos = col + self._width * row
+        self._tiles[pos] = value
+        self._positions[value] = pos
 
     def clone(self):
         """
         Make a copy of the puzzle to update during solving
         Returns a Puzzle object
         """
-        new_puzzle = Puzzle(self._height, self._width, self._grid)
+        new_puzzle = Puzzle(self._height, self._width, self._rows())
         return new_puzzle
 
     ########################################################
     # Core puzzle methods
 
+    def is_solvable(self):
+        """
+        Check whether the puzzle can be solved (tile permutation parity
+        matches the parity of the zero tile's row + column)
+        Returns a boolean
+        """
+        return poc_fifteen_instances.is_solvable(self._width, self._tiles)
+
     def current_position(self, solved_row, solved_col):
         """
         Locate the current position of the tile that will be at
@@ -95,41 +116,63 @@ class Puzzle:
         Returns a tuple of two integers        
         """
         solved_value = (solved_col + self._width * solved_row)
-
-        for row in range(self._height):
-            for col in range(self._width):
-                if self._grid[row][col] == solved_value:
-                    return (row, col)
-        assert False, "Value " + str(solved_value) + " not found"
+        return divmod(self._positions[solved_value], self._width)
 
     def update_puzzle(self, move_string):
         """
         Updates the puzzle state based on the provided move string
         """
-        zero_row, zero_col = self.current_position(0, 0)
+        tiles = self._tiles
+        positions = self._positions
+        width = self._width
+        zero = positions[0]
+        zero_row, zero_col = divmod(zero, width)
         for direction in move_string:
             if direction == "l":
                 assert zero_col > 0, "move off grid: " + direction + str(self.get_row_col(0))
-                self._grid[zero_row][zero_col] = self._grid[zero_row][zero_col - 1]
-                self._grid[zero_row][zero_col - 1] = 0
+                target = zero - 1
                 zero_col -= 1
             elif direction == "r":
-                assert zero_col < self._width - 1, "move off grid: " + direction + str(self.get_row_col(0))
-                self._grid[zero_row][zero_col] = self._grid[zero_row][zero_col + 1]
-                self._grid[zero_row][zero_col + 1] = 0
+                assert zero_col < width - 1, "move off grid: " + direction + str(self.get_row_col(0))
+                target = zero + 1
                 zero_col += 1
             elif direction == "u":
                 assert zero_row > 0, "move off grid: " + direction + str(self.get_row_col(0))
-                self._grid[zero_row][zero_col] = self._grid[zero_row - 1][zero_col]
-                self._grid[zero_row - 1][zero_col] = 0
+                target = zero - width
                 zero_row -= 1
             elif direction == "d":
                 assert zero_row < self._height - 1, "move off grid: " + direction + str(self.get_row_col(0))
-                self._grid[zero_row][zero_col] = self._grid[zero_row + 1][zero_col]
-                self._grid[zero_row + 1][zero_col] = 0
+                target = zero + width
                 zero_row += 1
             else:
                 assert False, "invalid direction: " + direction + str(self.get_row_col(0))
+            tile = tiles[target]
+            tiles[zero] = tile
+            positions[tile] = zero
+            tiles[target] = 0
+            positions[0] = target
+            zero = target
+
+    def apply_macro(self, move_string):
+        """
+        Apply a fixed move string of the solver as one precomputed
+        permutation (see poc_fifteen_moves.compile_macro); the string is
+        bounds checked as a whole, so use update_puzzle for user input
+        """
+        width = self._width
+        min_row, max_row, min_col, max_col, dests, sources = \
+            poc_fifteen_moves.compile_macro(move_string, width)
+        tiles = self._tiles
+        positions = self._positions
+        zero = positions[0]
+        zero_row, zero_col = divmod(zero, width)
+        assert (zero_row + min_row >= 0 and zero_row + max_row < self._height and
+                zero_col + min_col >= 0 and zero_col + max_col < width), \
+            "move off grid: " + move_string + str((zero_row, zero_col))
+        values = [tiles[zero + source] for source in sources]
+        for dest, value in zip(dests, values):
+            tiles[zero + dest] = value
+            positions[value] = zero + dest
 
     ##################################################################
     # Phase one methods
@@ -156,7 +199,49 @@ class Puzzle:
                     okay -=1
                         
         return okay == 3
-       
+
+    def position_tile(self, target_row, target_col, tile_row, tile_col):
+        """
+        Move the tile at (tile_row, tile_col) to (target_row, target_col),
+        with the zero tile starting on the target and ending just left of it
+        The tile must be above the target row or in the target row; cells
+        right of the target are only used when the tile starts there
+        Updates puzzle and returns a move string
+        """
+        move_temp = ""
+        if tile_row == target_row and tile_col < target_col:
+            move_temp += "l"*(target_col-tile_col)
+            move_temp += "urrdl"*(target_col-tile_col-1)
+        elif tile_row == target_row:
+            move_temp += "r"*(tile_col-target_col)
+            move_temp += "ulldr"*(tile_col-target_col-1)
+            move_temp += "ulld"
+        else:
+            move_temp += "u"*(target_row-tile_row)
+            # rows the tile still has to move down, the zero tile above it
+            rows_left = target_row-tile_row-1
+            if tile_col < target_col:
+                move_temp += "l"*(target_col-tile_col)
+                if tile_row > 0:
+                    move_temp += "urrdl"*(target_col-tile_col-1)
+                else:
+                    move_temp += "drrul"*(target_col-tile_col-1)
+                move_temp += "dru"
+            elif tile_col > target_col:
+                move_temp += "r"*(tile_col-target_col)
+                if tile_row > 0:
+                    move_temp += "ulldr"*(tile_col-target_col-1)
+                    move_temp += "ul"
+                    rows_left += 1
+                else:
+                    move_temp += "dllur"*(tile_col-target_col-1)
+                    move_temp += "dlu"
+            move_temp += "lddru"*rows_left
+            move_temp += "ld"
+
+        self.update_puzzle(move_temp)
+        return move_temp
+
     def solve_interior_tile(self, target_row, target_col):
         """
         Place correct tile at target position
@@ -181,41 +266,14 @@ class Puzzle:
                     break
                 elif self.current_position(target_row, target_col)==(target_row-1, target_col):
                     move[0] +="lurdlurdl"
-                    self.update_puzzle("lurdlurdl")
+                    self.apply_macro("lurdlurdl")
                     move[1]=True
                     break
                 else:
-                    move_temp = ""
-                    move_temp +="l"*target_col
-                    move_temp +="u"*target_row 
-                    move_temp +="r"*(self._width-1) 
-                    move_temp +="d" 
-                    move_temp +="l"*(self._width-2)
-                    
-                    row_left = target_row - 2
-                    
-                    while row_left > 0:                        
-                        if row_left==1:
-                            move_temp +="d"
-                            move_temp += "r"*(self._width-2)                       
-                            move_temp += "u"
-                            move_temp +="l"*(self._width-2)
-                            move_temp +="d"
-                            row_left -=1
-                        else:
-                            move_temp +="d"
-                            move_temp += "r"*(self._width-2)                       
-                            move_temp += "d"
-                            move_temp +="l"*(self._width-2)
-                            row_left -=2
-           
-                    # return to initial position
-                    move_temp +="l"
-                    move_temp +="d"
-                    move_temp +="r"*target_col
-                    
-                    self.update_puzzle(move_temp)
-                    move[0] += move_temp
+                    tile_row, tile_col = self.current_position(target_row, target_col)
+                    move[0] += self.position_tile(target_row, target_col, tile_row, tile_col)
+                    move[1]=True
+                    break
                                         
         return move[0]
             
@@ -235,51 +293,31 @@ class Puzzle:
                     self.update_puzzle("u"+"r"*(self._width-1))
                     move[1]=True
                     break
-                elif self.current_position(target_row, 0)==(target_row-1, 1):
-                    move[0] +="ruldruldrdlurdluruldrdlu"+"r"*(self._width-1) 
-                    self.update_puzzle("ruldruldrdlurdluruldrdlu"+"r"*(self._width-1))
-                    move[1]=True
-                    break
                 elif self.current_position(target_row, 0)==(target_row-2, 0):
                     move[0] += "rulurddlu"+"r"*(self._width-1) 
-                    self.update_puzzle("rulurddlu"+"r"*(self._width-1))
+                    self.apply_macro("rulurddlu")
+                    self.update_puzzle("r"*(self._width-1))
                     move[1]=True
                     break
                 elif self.current_position(target_row, 0)==(target_row-2, 1):
                     move[0] +="urdlurdluruldrdlu"+"r"*(self._width-1)
-                    self.update_puzzle("urdlurdluruldrdlu"+"r"*(self._width-1))
+                    self.apply_macro("urdlurdluruldrdlu")
+                    self.update_puzzle("r"*(self._width-1))
                     move[1]=True
                     break
                 else:
-                    move_temp = ""               
-                    move_temp +="u"*target_row 
-                    move_temp +="r"*(self._width-1) 
-                    move_temp +="d" 
-                    move_temp +="l"*(self._width-2)
-                    
-                    row_left = target_row - 2
-                    
-                    while row_left > 0:                        
-                        if row_left==1:
-                            move_temp +="d"
-                            move_temp += "r"*(self._width-2)                       
-                            move_temp += "u"
-                            move_temp +="l"*(self._width-2)
-                            move_temp +="d"
-                            row_left -=1
-                        else:
-                            move_temp +="d"
-                            move_temp += "r"*(self._width-2)                       
-                            move_temp += "d"
-                            move_temp +="l"*(self._width-2)
-                            row_left -=2
-           
-                    # return to initial position
-                    move_temp +="dlur"
-                    move_temp +="dlurdl"
-                    
+                    # bring the tile to (target_row-1, 1) with the zero tile
+                    # on its left, then finish with a 3x2 move
+                    move_temp = "ur"
                     self.update_puzzle(move_temp)
+                    tile_row, tile_col = self.current_position(target_row, 0)
+                    move_temp += self.position_tile(target_row-1, 1, tile_row, tile_col)
+                    move_temp +="ruldrdlurdluurddlur"+"r"*(self._width-2)
+                    self.apply_macro("ruldrdlurdluurddlur")
+                    self.update_puzzle("r"*(self._width-2))
                     move[0] += move_temp
+                    move[1]=True
+                    break
                                                
         return move[0]
 
@@ -359,30 +397,33 @@ class Puzzle:
                     break
                 elif self.current_position(0, target_col)==(1, target_col-1):                    
                     move[0] +="lldruldrurdluldrruld"
-                    self.update_puzzle("lldruldrurdluldrruld")
+                    self.apply_macro("lldruldrurdluldrruld")
                     move[1]=True
                     break                                
                 elif self.current_position(0, target_col)==(1, target_col-2):                     
                     move[0] += "ldruldruldlurrdlurdl" 
-                    self.update_puzzle("ldruldruldlurrdlurdl")
+                    self.apply_macro("ldruldruldlurrdlurdl")
                     move[1]=True
                     break               
                 elif self.current_position(0, target_col)==(0, target_col-2):                   
                     move[0] += "lldruldrruldruldlurdruld" 
-                    self.update_puzzle("lldruldrruldruldlurdruld")
+                    self.apply_macro("lldruldrruldruldlurdruld")
                     move[1]=True
                     break
          
                 else:
-                    move_temp = ""               
-                    move_temp +="l"*target_col 
-                    move_temp +="d"
-                    move_temp +="r"*(target_col-1)
-                    move_temp +="u" 
-                    move_temp +="r"
-                    
+                    # drag the tile right to (0, target_col-2) and bring
+                    # the zero tile back to (0, target_col) around it
+                    tile_row, tile_col = self.current_position(0, target_col)
+                    move_temp = ""
+                    move_temp +="l"*(target_col-tile_col)
+                    if tile_row == 1:
+                        move_temp +="drul"
+                    move_temp +="drrul"*(target_col-tile_col-3)
+                    move_temp +="drrur"
+
                     self.update_puzzle(move_temp)
-                    
+
                     move[0] += move_temp
                                        
         return move[0]
@@ -405,7 +446,7 @@ class Puzzle:
                     break
                 elif self.current_position(1, target_col)==(1, target_col-1):
                     move[0] +="uldruldru"
-                    self.update_puzzle("uldruldru")
+                    self.apply_macro("uldruldru")
                     move[1]=True
                     break
                 elif self.current_position(1, target_col)==(0, target_col-1):
@@ -414,12 +455,20 @@ class Puzzle:
                     move[1]=True
                     break
                 else:
+                    # drag the tile right to column target_col-1 and bring
+                    # the zero tile back to (1, target_col) around it
+                    tile_row, tile_col = self.current_position(1, target_col)
                     move_temp = ""
-                    move_temp +="u"
-                    move_temp +="l"*target_col
-                    move_temp +="d"
-                    move_temp +="r"*target_col
-                   
+                    if tile_row == 1:
+                        move_temp +="l"*(target_col-tile_col)
+                        move_temp +="urrdl"*(target_col-tile_col-2)
+                        move_temp +="urrd"
+                    else:
+                        move_temp +="u"
+                        move_temp +="l"*(target_col-tile_col)
+                        move_temp +="drrul"*(target_col-tile_col-2)
+                        move_temp +="drr"
+
                     self.update_puzzle(move_temp)
                     move[0] += move_temp
                                         
@@ -448,39 +497,92 @@ class Puzzle:
     def solve_puzzle(self):
         """
         Generate a solution string for a puzzle
+        Raises ValueError if the puzzle cannot be solved
         Updates the puzzle and returns a move string
         """
-        move=""
-        
+        return "".join(self.iter_solve_puzzle())
+
+    def iter_solve_puzzle(self):
+        """
+        Solve the puzzle one tile at a time
+        Raises ValueError at once if the puzzle cannot be solved
+        Returns an iterator of move strings, one per placed tile, that
+        updates the puzzle as it is consumed
+        """
+        if not self.is_solvable():
+            raise ValueError("unsolvable puzzle")
+        return self._solve_chunks()
+
+    def _solve_chunks(self):
+        """
+        Generator behind iter_solve_puzzle
+        """
+        # a solvable single row or column has its tiles in order already,
+        # only the 0-tile has to go home
+        if self._height < 2 or self._width < 2:
+            zero_row, zero_col = self.get_row_col(0)
+            move_temp = "u"*zero_row + "l"*zero_col
+            self.update_puzzle(move_temp)
+            yield move_temp
+            return
+
         # check if 0-tile is in the last place, if not put it there        
-        if self.get_row_col(0)!=(self._width-1, self._height-1):
+        if self.get_row_col(0)!=(self._height-1, self._width-1):
             move_temp =""
             move_temp +="d"*(self._height-self.get_row_col(0)[0]-1)
             move_temp +="r"*(self._width-self.get_row_col(0)[1]-1)
             self.update_puzzle(move_temp)
-            move += move_temp
+            yield move_temp
 
         # solve_interior_tile and solve_col0_tile for row >=2
         for row in range(self._height-1, 1, -1):
             for col in range(self._width-1, -1, -1):
                 if col!=0:
                     assert self.lower_row_invariant(row, col), "error at ("+str(row)+","+str(col)+")"
-                    move += self.solve_interior_tile(row, col)
+                    yield self.solve_interior_tile(row, col)
                 else:
-                    move += self.solve_col0_tile(row)
+                    yield self.solve_col0_tile(row)
                 
         # solve_row1_tile and solve_row0_tile for row <2, and col<=1   
         for col in range(self._width-1, 1, -1):
             assert self.row1_invariant(col), "error at (1,"+str(col)+")"
-            move += self.solve_row1_tile(col)
+            yield self.solve_row1_tile(col)
             assert self.row0_invariant(col), "error at (0,"+str(col)+")"
-            move += self.solve_row0_tile(col)
+            yield self.solve_row0_tile(col)
             
         # solve_2x2
-        move += self.solve_2x2()
-        
+        yield self.solve_2x2()
+
+    def solve_optimal(self, databases=None, directory=".", weight=1):
+        """
+        Generate a shortest solution string with IDA* search, or with
+        weight > 1 one at most weight times longer than the shortest
+        Practical for boards up to 4x4, and 5x5 with a weight of about 2;
+        databases default to the pattern databases of
+        poc_fifteen_ida.default_databases, kept as
+        pdb_<height>x<width>_*.bin files in directory: the first 4x4 or
+        5x5 call builds and writes them there, which takes minutes
+        Raises ValueError if the puzzle cannot be solved
+        Updates the puzzle and returns a move string
+        """
+        move = poc_fifteen_ida.solve(self._height, self._width,
+                                     self._tiles, databases, directory,
+                                     weight)
+        self.update_puzzle(move)
+        return move
+
+    def solve_bidirectional(self):
+        """
+        Generate a shortest solution string with bidirectional BFS
+        Practical for boards up to 3x3 and 2x4
+        Updates the puzzle and returns a move string
+        """
+        move = poc_fifteen_bidir.solve(self._height, self._width, self._tiles)
+        self.update_puzzle(move)
         return move
 
 # Start interactive simulation
 
-#poc_fifteen_gui.FifteenGUI(Puzzle(4, 4))
+if __name__ == "__main__":
+    import poc_fifteen_gui
+    poc_fifteen_gui.FifteenGUI(Puzzle(4, 4))